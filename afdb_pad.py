@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the AfDB PAD analysis.
+
+    python afdb_pad.py scan [--start N] [--limit N] [--fast] [--no-block]
+    python afdb_pad.py resume [--batch-size N]
+    python afdb_pad.py merge
+    python afdb_pad.py report
+    python afdb_pad.py diff [--old pad_results_previous.json]
+    python afdb_pad.py serve [--workers N] [--port N]
+    python afdb_pad.py submit PROJECT_ID... [--url URL] [--all]
+    python afdb_pad.py discover [--append] [--enqueue PORT]
+    python afdb_pad.py stats [--field done]
+
+Only the standard library is imported at startup. Selenium, pandas and the
+scanner modules are imported inside the subcommand that needs them, so quick
+queries such as `stats` start in milliseconds and can be used in shell loops
+and cron jobs.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from data_files import CSV_FILENAME, RESULTS_FILENAME, derived_filename, result_files
+
+def done_project_ids(results_filename):
+    """Project IDs already present in the results file or in batch outputs"""
+    from result_stream import iter_results
+    done = set()
+    for filename in result_files(results_filename):
+        if os.path.exists(filename):
+            done.update(result['project_id'] for result in iter_results(filename, fields=('project_id',)))
+    return done
+
+def cmd_scan(args):
+    if args.fast:
+        from fast_pad_check import resume_analysis
+        resume_analysis(args.start, args.limit or sys.maxsize, args.csv, args.results, not args.no_block)
+    elif args.start or args.limit:
+        from continue_analysis import continue_pad_analysis
+        continue_pad_analysis(args.start, args.limit or sys.maxsize, args.csv, args.results, not args.no_block)
+    else:
+        from check_all_pads import main as scan_all
+        scan_all(args.csv, args.results, block_resources=not args.no_block)
+
+def cmd_resume(args):
+    # Same coalesced URL list that continue_pad_analysis slices
+    from check_all_pads import read_csv_urls
+    project_ids = [project_id for project_id, _ in read_csv_urls(args.csv)]
+    done = done_project_ids(args.results)
+    remaining = [i for i, project_id in enumerate(project_ids) if project_id not in done]
+    if not remaining:
+        print(f"All {len(project_ids)} projects already analysed")
+        return
+    print(f"{len(remaining)} of {len(project_ids)} projects remaining, resuming from URL {remaining[0] + 1}")
+
+    from continue_analysis import continue_pad_analysis
+    continue_pad_analysis(remaining[0], args.batch_size, args.csv, args.results)
+
+def cmd_merge(args):
+    from merge_pad_results import merge_pad_results
+    merge_pad_results(args.csv, args.results, args.output)
+
+def cmd_report(args):
+    from generate_complete_table import generate_html_table
+    generate_html_table(args.results, args.csv, args.output_prefix, args.store)
+
+def cmd_diff(args):
+    from diff_results import run_diff
+    run_diff(args.old or derived_filename(args.results, 'previous'), args.results,
+             args.old_links, args.links, args.output)
+
+def cmd_serve(args):
+    from scan_service import serve
+    serve(args.port, args.workers, args.csv, results_filename=args.results)
+
+def cmd_submit(args):
+    from scan_service import submit
+    response = submit(args.project_ids, args.url, args.all, args.port)
+    for job in response['jobs']:
+        print(f"{job['id']}\t{job['project_id']}\t{job['status']}")
+
+def cmd_discover(args):
+    from discover_projects import discover_projects
+    try:
+        discover_projects(args.listing_url, args.csv, interval=args.interval, max_pages=args.max_pages,
+                          record_dir=args.record, append=args.append, enqueue_port=args.enqueue)
+    except RuntimeError as e:
+        sys.exit(f"❌ {e}")
+
+def cmd_stats(args):
+    from rollups import load_rollups, pad_summary
+    # Same result files as resume, so "done" here is what resume skips
+    summary = pad_summary(load_rollups(args.csv, args.results))
+    stats = {
+        'catalogue': summary['catalogue'],
+        'done': summary['analyzed'],
+        'with_pad': summary['with_pad'],
+        'without_pad': summary['without_pad'],
+        'errors': summary['errors'],
+        'remaining': summary['unknown']
+    }
+
+    if args.field:
+        print(stats[args.field])
+    elif args.json:
+        print(json.dumps(stats))
+    else:
+        for key, value in stats.items():
+            print(f"{key}: {value}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='afdb-pad', description='AfDB PAD analysis')
+    parser.add_argument('--csv', default=CSV_FILENAME, help='project catalogue CSV')
+    parser.add_argument('--results', default=RESULTS_FILENAME, help='PAD results JSON')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    scan = subparsers.add_parser('scan', help='check project pages for PADs')
+    scan.add_argument('--start', type=int, default=0, help='index of the first URL to check')
+    scan.add_argument('--limit', type=int, help='number of URLs to check')
+    scan.add_argument('--fast', action='store_true', help='shorter page wait with one warm browser (same classifier)')
+    scan.add_argument('--no-block', action='store_true',
+                      help='load pages in full (baseline for measuring what resource blocking saves)')
+    scan.set_defaults(func=cmd_scan)
+
+    resume = subparsers.add_parser('resume', help='continue from the first project without a result')
+    resume.add_argument('--batch-size', type=int, default=50, help='number of URLs to check')
+    resume.set_defaults(func=cmd_resume)
+
+    merge = subparsers.add_parser('merge', help='add a PAD status column to the catalogue')
+    merge.add_argument('--output', default='afdb_projects_with_pad_status.csv', help='merged CSV to write')
+    merge.set_defaults(func=cmd_merge)
+
+    report = subparsers.add_parser('report', help='generate the HTML and CSV results table')
+    report.add_argument('--output-prefix', default='Complete_AfDB_PAD_Analysis_Table',
+                        help='file name prefix for the .html and .csv outputs')
+    report.add_argument('--store', default='pad_snippets.json',
+                        help='snippet store that compact evidence in --results refers to')
+    report.set_defaults(func=cmd_report)
+
+    diff = subparsers.add_parser('diff', help='list PAD status and document link changes since the previous run')
+    diff.add_argument('--old', help='previous results JSON (default: <results>_previous.json)')
+    diff.add_argument('--old-links', default='document_links_previous.json', help='previous document links JSON')
+    diff.add_argument('--links', default='document_links.json', help='current document links JSON')
+    diff.add_argument('--output', default='pad_changes.jsonl', help='change log to write (JSON lines)')
+    diff.set_defaults(func=cmd_diff)
+
+    serve = subparsers.add_parser('serve', help='run the scan service with warm browsers and a local job API')
+    serve.add_argument('--port', type=int, default=8765, help='local HTTP port')
+    serve.add_argument('--workers', type=int, default=2, help='number of warm browser workers')
+    serve.set_defaults(func=cmd_serve)
+
+    submit = subparsers.add_parser('submit', help='queue projects on a running scan service')
+    submit.add_argument('project_ids', nargs='*', help='project identifiers, e.g. P-ZW-AAG-008')
+    submit.add_argument('--url', action='append', help='project page URL (repeatable)')
+    submit.add_argument('--all', action='store_true', help='queue every project in the catalogue')
+    submit.add_argument('--port', type=int, default=8765, help='scan service port')
+    submit.set_defaults(func=cmd_submit)
+
+    discover = subparsers.add_parser('discover', help='find projects on the portal listing that are not in the catalogue')
+    discover.add_argument('--listing-url', required=True,
+                          help='listing URL template with {page} and {per_page} (file:// for a recording)')
+    discover.add_argument('--interval', type=float, default=1.0, help='minimum seconds between requests')
+    discover.add_argument('--max-pages', type=int, help='stop after this many pages')
+    discover.add_argument('--record', help='save each fetched page into this directory')
+    discover.add_argument('--append', action='store_true', help='append new projects to the catalogue CSV')
+    discover.add_argument('--enqueue', type=int, metavar='PORT', help='queue new projects on the scan service at PORT')
+    discover.set_defaults(func=cmd_discover)
+
+    stats = subparsers.add_parser('stats', help='print progress and PAD counts')
+    stats.add_argument('--field', choices=['catalogue', 'done', 'remaining', 'with_pad', 'without_pad', 'errors'],
+                       help='print a single value')
+    stats.add_argument('--json', action='store_true', help='print all values as one JSON object')
+    stats.set_defaults(func=cmd_stats)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
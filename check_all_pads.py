@@ -1,14 +1,128 @@
 #!/usr/bin/env python3
 import csv
 import time
-import requests
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+import os
 import re
 import json
+from fnmatch import fnmatchcase
+from data_files import CSV_FILENAME, RESULTS_FILENAME, derived_filename
+from evidence_store import add_evidence, format_evidence, load_snippet_store, save_results, save_snippet_store
+from rollups import add_result, load_rollups, save_rollups
+from project_urls import coalesce_projects, dedupe_document_links
+
+# PAD-related keywords, searched case-insensitively in the page source
+PAD_KEYWORDS = [
+    "project appraisal document",
+    "appraisal document", 
+    "Project Appraisal",
+    "appraisal report",
+    "project document",
+    "appraisal study"
+]
+
+# Context snippets containing any of these are CSS/HTML noise, not evidence
+CSS_NOISE = ['padding', 'margin', 'border', 'background', 'color', 'font']
+
+PAD_KEYWORD_PATTERNS = [(keyword, re.compile(re.escape(keyword), re.IGNORECASE)) for keyword in PAD_KEYWORDS]
+
+# Single-pass probe over all keywords at once
+PAD_PROBE = re.compile('|'.join(re.escape(keyword) for keyword in PAD_KEYWORDS), re.IGNORECASE)
+
+def probe_for_pad(page_source):
+    """Cheap first stage: does the page mention any PAD keyword at all?"""
+    return PAD_PROBE.search(page_source) is not None
+
+def extract_pad_matches(page_source):
+    """Thorough second stage: (keyword, offset, context) for each match, filtering CSS/HTML noise"""
+    pad_matches = []
+    
+    for keyword, pattern in PAD_KEYWORD_PATTERNS:
+        for match in pattern.finditer(page_source):
+            start = max(0, match.start() - 100)
+            end = min(len(page_source), match.end() + 100)
+            context = page_source[start:end].replace('\n', ' ').strip()
+            if not any(css_noise in context.lower() for css_noise in CSS_NOISE):
+                pad_matches.append((keyword, match.start(), context))
+    
+    return pad_matches
+
+# Resources the classifier never looks at: images, fonts, stylesheets,
+# map tiles and analytics. Patterns use the DevTools wildcard syntax.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.css",
+    "*tile.openstreetmap.org*", "*basemaps.cartocdn.com*", "*api.mapbox.com*",
+    "*arcgisonline.com*", "*/tiles/*",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*hotjar.com*", "*facebook.net*"
+]
+
+def block_non_essential_resources(driver):
+    """Block non-essential resources via the DevTools protocol"""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"Could not enable request blocking: {str(e)}")
+
+def is_blockable(url):
+    """Does a URL match one of BLOCKED_URL_PATTERNS?"""
+    return any(fnmatchcase(url, pattern) for pattern in BLOCKED_URL_PATTERNS)
+
+def page_transfer_stats(driver):
+    """Summarise network traffic for the last page from the performance log
+
+    Requires the 'goog:loggingPrefs' performance capability. Returns the
+    number of requests made, how many were blocked, bytes transferred, and
+    how many of those bytes came from blockable URLs. With blocking off,
+    bytes_blockable is what blocking saves on the page.
+    """
+    stats = {'requests': 0, 'blocked': 0, 'bytes_transferred': 0, 'bytes_blockable': 0}
+    blockable_requests = set()
+    try:
+        entries = driver.get_log('performance')
+    except Exception:
+        return stats
+    
+    for entry in entries:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError):
+            continue
+        method = message.get('method')
+        params = message.get('params', {})
+        if method == 'Network.requestWillBeSent':
+            stats['requests'] += 1
+            if is_blockable(params.get('request', {}).get('url', '')):
+                blockable_requests.add(params.get('requestId'))
+        elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+            stats['blocked'] += 1
+        elif method == 'Network.loadingFinished':
+            length = int(params.get('encodedDataLength', 0))
+            stats['bytes_transferred'] += length
+            if params.get('requestId') in blockable_requests:
+                stats['bytes_blockable'] += length
+    
+    return stats
+
+def report_transfer_stats(driver, project_id):
+    """Print blocked requests and bytes transferred for the last page"""
+    stats = page_transfer_stats(driver)
+    if stats['requests'] and stats['blocked']:
+        print(f"   🚫 {project_id}: blocked {stats['blocked']}/{stats['requests']} requests, "
+              f"{stats['bytes_transferred'] / 1024:.1f} KB transferred")
+    elif stats['requests']:
+        # Unblocked baseline: blocking would have saved the blockable bytes
+        print(f"   📶 {project_id}: {stats['requests']} requests, "
+              f"{stats['bytes_transferred'] / 1024:.1f} KB transferred, "
+              f"{stats['bytes_blockable'] / 1024:.1f} KB blockable")
+    return stats
 
 def extract_document_links(driver, project_id):
     """Extract actual document links from the project page"""
@@ -33,88 +147,95 @@ def extract_document_links(driver, project_id):
             except:
                 continue
         
-        return document_links
+        return dedupe_document_links(document_links)
     except Exception as e:
         print(f"Error extracting document links for {project_id}: {str(e)}")
         return []
 
-def check_for_pad(url, project_id):
-    """Check if a project page contains Project Appraisal Document references"""
+def create_driver(block_resources=True):
+    """Start a headless Chrome, by default with non-essential resources blocked
+
+    block_resources=False loads pages in full, as a baseline for measuring
+    what blocking saves.
+    """
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+    chrome_options.binary_location = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    
+    driver = webdriver.Chrome(options=chrome_options)
+    if block_resources:
+        block_non_essential_resources(driver)
+    return driver
+
+def check_for_pad(url, project_id, snippet_store=None, driver=None, wait=5, block_resources=True):
+    """Check if a project page contains Project Appraisal Document references
+
+    With a snippet_store, evidence is returned as compact items
+    (see evidence_store) instead of full context strings. A warm driver
+    can be passed in; it is left running for the caller to reuse. wait is
+    the number of seconds the page gets to render before it is read.
+    block_resources applies to a driver created here.
+
+    A page that cannot be loaded or read raises, so callers record an
+    'error' result instead of a PAD-less one.
+    """
     print(f"Checking {project_id}: {url}")
     
     try:
-        # Set up Chrome options
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        chrome_options.binary_location = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
-        
-        # Initialize the driver
-        driver = webdriver.Chrome(options=chrome_options)
+        # Initialize the driver unless the caller provides one
+        own_driver = driver is None
+        if own_driver:
+            driver = create_driver(block_resources)
         
         try:
             # Navigate to the URL
             driver.get(url)
             
             # Wait for page to load
-            time.sleep(5)
+            time.sleep(wait)
             
             # Get the page source
             page_source = driver.page_source
+            report_transfer_stats(driver, project_id)
             
-            # Check for PAD-related content
-            pad_keywords = [
-                "project appraisal document",
-                "appraisal document", 
-                "Project Appraisal",
-                "appraisal report",
-                "project document",
-                "appraisal study"
-            ]
-            
-            found_pad = False
-            pad_evidence = []
+            # Cheap probe first: pages without any PAD keyword skip the
+            # context extraction and link harvesting entirely
+            if not probe_for_pad(page_source):
+                print(f"❌ No PAD found in {project_id}")
+                return False, [], []
             
-            for keyword in pad_keywords:
-                if re.search(keyword, page_source, re.IGNORECASE):
-                    found_pad = True
-                    # Find the context around the keyword
-                    matches = re.finditer(keyword, page_source, re.IGNORECASE)
-                    for match in matches:
-                        start = max(0, match.start() - 100)
-                        end = min(len(page_source), match.end() + 100)
-                        context = page_source[start:end].replace('\n', ' ').strip()
-                        # Filter out CSS/HTML noise
-                        if not any(css_noise in context.lower() for css_noise in ['padding', 'margin', 'border', 'background', 'color', 'font']):
-                            pad_evidence.append(f"Found '{keyword}' in context: ...{context}...")
+            pad_matches = extract_pad_matches(page_source)
+            pad_evidence = [format_evidence(keyword, context) for keyword, _, context in pad_matches]
             
             # Extract document links
             document_links = extract_document_links(driver, project_id)
             
-            if found_pad:
-                print(f"✅ PAD FOUND in {project_id}")
-                for evidence in pad_evidence[:2]:  # Show first 2 pieces of evidence
-                    print(f"   {evidence}")
-                if document_links:
-                    print(f"   📄 Found {len(document_links)} potential document links")
-                return True, pad_evidence, document_links
-            else:
-                print(f"❌ No PAD found in {project_id}")
-                return False, [], document_links
+            print(f"✅ PAD FOUND in {project_id}")
+            for evidence in pad_evidence[:2]:  # Show first 2 pieces of evidence
+                print(f"   {evidence}")
+            if document_links:
+                print(f"   📄 Found {len(document_links)} potential document links")
+            if snippet_store is not None:
+                pad_evidence = [add_evidence(snippet_store, keyword, offset, context)
+                                for keyword, offset, context in pad_matches]
+            return True, pad_evidence, document_links
                 
         finally:
-            driver.quit()
+            if own_driver:
+                driver.quit()
             
     except Exception as e:
         print(f"❌ Error checking {project_id}: {str(e)}")
-        return False, [], []
+        raise
 
 def read_csv_urls(filename):
-    """Read URLs from the CSV file"""
+    """Read URLs from the CSV file, one canonical URL per project"""
     urls = []
     try:
         with open(filename, 'r', encoding='utf-8') as file:
@@ -125,11 +246,11 @@ def read_csv_urls(filename):
                     urls.append((project_id, row['project_url']))
     except Exception as e:
         print(f"Error reading CSV file: {str(e)}")
-    return urls
+    # EN/FR variants of a project page are fetched only once
+    return coalesce_projects(urls)
 
-def main():
+def main(csv_filename=CSV_FILENAME, results_filename=RESULTS_FILENAME, block_resources=True):
     # Read URLs from CSV
-    csv_filename = "afdb_full_extraction_with_keywords.csv"
     all_urls = read_csv_urls(csv_filename)
     
     print(f"Found {len(all_urls)} URLs in CSV file")
@@ -143,12 +264,16 @@ def main():
     results = []
     document_links_all = []
     errors = []
+    snippet_store = load_snippet_store()
+    # Aggregates are updated as each result arrives
+    rollup_cube = load_rollups(csv_filename, results_filename)
     
     for i, (project_id, url) in enumerate(urls_to_check, 1):
         print(f"\n[{i}/{len(urls_to_check)}] ", end="")
         
         try:
-            has_pad, evidence, document_links = check_for_pad(url, project_id)
+            has_pad, evidence, document_links = check_for_pad(url, project_id, snippet_store,
+                                                           block_resources=block_resources)
             
             results.append({
                 'project_id': project_id,
@@ -174,6 +299,7 @@ def main():
                 'evidence': [],
                 'error': str(e)
             })
+        add_result(rollup_cube, results[-1])
         
         # Add a small delay to be respectful to the server
         time.sleep(1)
@@ -181,8 +307,8 @@ def main():
         # Save progress every 50 URLs
         if i % 50 == 0:
             print(f"\n--- Progress saved at {i} URLs ---")
-            with open(f'pad_results_progress_{i}.json', 'w') as f:
-                json.dump(results, f, indent=2)
+            save_results(results, derived_filename(results_filename, f'progress_{i}'))
+            save_snippet_store(snippet_store)
     
     # Summary
     print("\n" + "=" * 80)
@@ -203,14 +329,21 @@ def main():
     print(f"\nTotal projects checked: {len(results)}")
     print(f"Success rate: {len(projects_with_pad)/len(results)*100:.1f}%")
     
+    # Keep the previous run so diff_results.py can report what changed
+    for filename in [results_filename, 'document_links.json']:
+        if os.path.exists(filename):
+            os.replace(filename, derived_filename(filename, 'previous'))
+    
     # Save results to files
-    with open('pad_results.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    save_results(results, results_filename)
+    save_snippet_store(snippet_store)
+    save_rollups(rollup_cube, csv_filename, results_filename)
     
+    document_links_all = dedupe_document_links(document_links_all)
     with open('document_links.json', 'w') as f:
         json.dump(document_links_all, f, indent=2)
     
-    print(f"\nResults saved to pad_results.json and document_links.json")
+    print(f"\nResults saved to {results_filename}, pad_snippets.json and document_links.json")
     
     # Save errors if any
     if errors:
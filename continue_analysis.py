@@ -5,21 +5,26 @@ This can be run to process the remaining URLs beyond the first 50.
 """
 
 import csv
-import json
 import time
 from check_all_pads import check_for_pad, read_csv_urls
+from data_files import CSV_FILENAME, RESULTS_FILENAME, derived_filename
+from evidence_store import load_snippet_store, save_results, save_snippet_store
 
-def continue_pad_analysis(start_index=50, batch_size=50):
+def continue_pad_analysis(start_index=50, batch_size=50, csv_filename=CSV_FILENAME,
+                          results_filename=RESULTS_FILENAME, block_resources=True):
     """
     Continue PAD analysis from a specific index
     
     Args:
         start_index (int): Starting index in the URL list
         batch_size (int): Number of URLs to process in this batch
+        csv_filename (str): Catalogue CSV to read URLs from
+        results_filename (str): Results file the batch file is named after
+        block_resources (bool): Block images, fonts, CSS, tiles and analytics
     """
     
     # Read all URLs from CSV
-    all_urls = read_csv_urls("afdb_full_extraction_with_keywords.csv")
+    all_urls = read_csv_urls(csv_filename)
     
     if start_index >= len(all_urls):
         print(f"Start index {start_index} is beyond the total number of URLs ({len(all_urls)})")
@@ -34,17 +39,28 @@ def continue_pad_analysis(start_index=50, batch_size=50):
     print("=" * 80)
     
     results = []
+    snippet_store = load_snippet_store()
     
     for i, (project_id, url) in enumerate(urls_to_check, start_index + 1):
         print(f"\n[{i}/{len(all_urls)}] ", end="")
-        has_pad, evidence, document_links = check_for_pad(url, project_id)
-        
-        results.append({
-            'project_id': project_id,
-            'url': url,
-            'has_pad': has_pad,
-            'evidence': evidence
-        })
+        try:
+            has_pad, evidence, document_links = check_for_pad(url, project_id, snippet_store,
+                                                               block_resources=block_resources)
+            
+            results.append({
+                'project_id': project_id,
+                'url': url,
+                'has_pad': has_pad,
+                'evidence': evidence
+            })
+        except Exception as e:
+            results.append({
+                'project_id': project_id,
+                'url': url,
+                'has_pad': False,
+                'evidence': [],
+                'error': str(e)
+            })
         
         # Add a small delay to be respectful to the server
         time.sleep(1)
@@ -61,9 +77,9 @@ def continue_pad_analysis(start_index=50, batch_size=50):
     print(f"Success rate: {len(projects_with_pad)/len(results)*100:.1f}%")
     
     # Save batch results
-    batch_filename = f"pad_results_batch_{start_index+1}_{end_index}.json"
-    with open(batch_filename, 'w') as f:
-        json.dump(results, f, indent=2)
+    batch_filename = derived_filename(results_filename, f"batch_{start_index+1}_{end_index}")
+    save_results(results, batch_filename)
+    save_snippet_store(snippet_store)
     
     print(f"\nBatch results saved to {batch_filename}")
     
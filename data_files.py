@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Default data file names shared by the analysis scripts.
+
+Also holds the source signature used by the cached sidecars (keyword index,
+rollups) to notice that the file they were built from has changed.
+"""
+
+import glob
+import os
+
+CSV_FILENAME = 'afdb_full_extraction_with_keywords.csv'
+RESULTS_FILENAME = 'pad_results.json'
+
+# Batch outputs written next to the results file by scan/resume runs
+BATCH_SUFFIXES = ['batch_*', 'fast_batch_*']
+
+def derived_filename(results_filename, suffix):
+    """Name of a file written alongside a results file, e.g. pad_results_batch_1_50.json"""
+    base, extension = os.path.splitext(results_filename)
+    return f'{base}_{suffix}{extension}'
+
+def service_results_filename(results_filename=RESULTS_FILENAME):
+    """JSON lines file the scan service appends its results to"""
+    return os.path.splitext(results_filename)[0] + '_service.jsonl'
+
+def result_files(results_filename=RESULTS_FILENAME):
+    """The results file, the batch outputs next to it and the service results
+
+    Every consumer (stats, resume, report, merge, rollups) reads this same
+    set, so they agree on which projects are done.
+    """
+    filenames = [results_filename]
+    for suffix in BATCH_SUFFIXES:
+        filenames.extend(sorted(glob.glob(derived_filename(results_filename, suffix))))
+    filenames.append(service_results_filename(results_filename))
+    return filenames
+
+def source_signature(filename):
+    """[size, mtime_ns] of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Run-to-run diff of PAD results, keyed on project_id.
+
+The previous run is reduced to a small hash table (status and document link
+URLs per project), and the new run is streamed against it. Only changes are
+emitted, as one JSON object per line:
+
+    {"change": "pad_added", "project_id": ..., "url": ...}
+    {"change": "pad_removed", ...}
+    {"change": "error", "project_id": ..., "error": ..., "had_pad": ...}
+    {"change": "error_resolved", "project_id": ..., "has_pad": ...}
+    {"change": "project_added", "project_id": ..., "has_pad": ...}
+    {"change": "project_removed", "project_id": ...}
+    {"change": "link_added", "project_id": ..., "url": ..., "text": ...}
+    {"change": "link_removed", "project_id": ..., "url": ...}
+
+A project whose new result is an error is reported as "error" rather than
+"pad_removed", since the status flip says nothing about the PAD itself.
+"""
+
+import argparse
+import json
+import os
+
+from data_files import RESULTS_FILENAME
+from project_urls import canonical_document_url
+from result_stream import iter_latest_results, iter_results
+
+PREVIOUS_RESULTS_FILENAME = 'pad_results_previous.json'
+LINKS_FILENAME = 'document_links.json'
+PREVIOUS_LINKS_FILENAME = 'document_links_previous.json'
+CHANGES_FILENAME = 'pad_changes.jsonl'
+
+# Only these fields of each result are needed for the diff
+RESULT_FIELDS = ('project_id', 'url', 'has_pad', 'error')
+
+def load_json(filename, fields=None):
+    """Stream records from a result or link file ([] if it does not exist)"""
+    if not filename or not os.path.exists(filename):
+        return []
+    return iter_results(filename, fields)
+
+def load_results(filename):
+    """One record per project; the last one wins in appended JSON lines files"""
+    return iter_latest_results([filename], RESULT_FIELDS)
+
+def links_by_project(links):
+    """Map project_id -> {canonical url: text} for a list of document links"""
+    by_project = {}
+    for link in links:
+        urls = by_project.setdefault(link['project_id'], {})
+        urls.setdefault(canonical_document_url(link['url']), link.get('text', ''))
+    return by_project
+
+def diff_results(old_results, new_results, old_links=(), new_links=()):
+    """Yield change records between two result sets (and their document links)
+
+    A page that failed to load is an error, not a removed PAD:
+
+    >>> old = [{'project_id': 'P-ZW-AAG-008', 'has_pad': True}]
+    >>> new = [{'project_id': 'P-ZW-AAG-008', 'has_pad': False, 'error': 'Timed out'}]
+    >>> [change['change'] for change in diff_results(old, new)]
+    ['error']
+    """
+    old_state = {}
+    for result in old_results:
+        old_state[result['project_id']] = (bool(result.get('has_pad')), result.get('error'))
+
+    for result in new_results:
+        project_id = result['project_id']
+        has_pad = bool(result.get('has_pad'))
+        error = result.get('error')
+        previous = old_state.pop(project_id, None)
+
+        if previous is None:
+            yield {'change': 'project_added', 'project_id': project_id, 'url': result.get('url'), 'has_pad': has_pad}
+            continue
+
+        had_pad, had_error = previous
+        if error and not had_error:
+            yield {'change': 'error', 'project_id': project_id, 'url': result.get('url'),
+                   'error': error, 'had_pad': had_pad}
+        elif had_error and not error:
+            yield {'change': 'error_resolved', 'project_id': project_id, 'url': result.get('url'), 'has_pad': has_pad}
+        elif has_pad and not had_pad:
+            yield {'change': 'pad_added', 'project_id': project_id, 'url': result.get('url')}
+        elif had_pad and not has_pad and not error:
+            yield {'change': 'pad_removed', 'project_id': project_id, 'url': result.get('url')}
+
+    for project_id in old_state:
+        yield {'change': 'project_removed', 'project_id': project_id}
+
+    old_by_project = links_by_project(old_links)
+    for project_id, urls in links_by_project(new_links).items():
+        previous_urls = old_by_project.pop(project_id, {})
+        for url, text in urls.items():
+            if url not in previous_urls:
+                yield {'change': 'link_added', 'project_id': project_id, 'url': url, 'text': text}
+        for url in previous_urls:
+            if url not in urls:
+                yield {'change': 'link_removed', 'project_id': project_id, 'url': url}
+    for project_id, previous_urls in old_by_project.items():
+        for url in previous_urls:
+            yield {'change': 'link_removed', 'project_id': project_id, 'url': url}
+
+def write_changes(changes, filename=CHANGES_FILENAME):
+    """Write change records as JSON lines; returns counts per change type"""
+    counts = {}
+    with open(filename, 'w', encoding='utf-8') as f:
+        for change in changes:
+            f.write(json.dumps(change) + '\n')
+            counts[change['change']] = counts.get(change['change'], 0) + 1
+    return counts
+
+def run_diff(old_filename=PREVIOUS_RESULTS_FILENAME, new_filename=RESULTS_FILENAME,
+             old_links_filename=PREVIOUS_LINKS_FILENAME, new_links_filename=LINKS_FILENAME,
+             output_filename=CHANGES_FILENAME):
+    """Diff two runs, write the change log and print a summary"""
+    if not os.path.exists(old_filename):
+        print(f"No previous results at {old_filename}; nothing to compare against")
+        return None
+
+    changes = diff_results(load_results(old_filename), load_results(new_filename),
+                           load_json(old_links_filename), load_json(new_links_filename))
+    counts = write_changes(changes, output_filename)
+
+    print(f"Compared {old_filename} -> {new_filename}")
+    if not counts:
+        print("No changes")
+    for change, count in sorted(counts.items()):
+        print(f"  {change}: {count}")
+    print(f"Change log saved to {output_filename}")
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description='Diff two PAD result files')
+    parser.add_argument('old', nargs='?', default=PREVIOUS_RESULTS_FILENAME, help='previous results JSON')
+    parser.add_argument('new', nargs='?', default=RESULTS_FILENAME, help='new results JSON')
+    parser.add_argument('--old-links', default=PREVIOUS_LINKS_FILENAME, help='previous document links JSON')
+    parser.add_argument('--new-links', default=LINKS_FILENAME, help='new document links JSON')
+    parser.add_argument('--output', default=CHANGES_FILENAME, help='change log to write (JSON lines)')
+    args = parser.parse_args()
+
+    run_diff(args.old, args.new, args.old_links, args.new_links, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Bulk project discovery from the MapAfrica project listing.
+
+Pages through the portal's project listing (or search endpoint), collects
+project identifiers, and diffs them against the catalogue's Identifier
+column. New projects are written to discovered_projects.json and can be
+appended to the catalogue CSV and/or queued on a running scan service.
+
+Identifiers are pulled out of each response with a pattern match, so the
+listing may be JSON or HTML. The listing URL is a template with {page} and
+{per_page} placeholders and may be a file:// URL, so a recorded copy of the
+listing (see --record) works as a local stand-in for testing. Requests are
+spaced by a minimum interval and 429/5xx responses are retried with backoff,
+honouring Retry-After.
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from data_files import CSV_FILENAME
+from project_urls import project_url
+from scan_service import submit
+
+DISCOVERED_FILENAME = 'discovered_projects.json'
+
+# The portal renders its listing with JavaScript and no listing endpoint has
+# been confirmed, so there is no default: pass the URL template explicitly.
+# fixtures/discovery holds a two-page recording in the --record format.
+PER_PAGE = 100
+
+# AfDB project identifiers: loans such as P-ZW-AAG-008 and grants such as
+# G-Z1-AA0-SUP-001 (four or five segments)
+IDENTIFIER_PATTERN = re.compile(r'\b[PG]-[A-Z0-9]{2}-[A-Z0-9]{3}(?:-[A-Z0-9]{3})?-\d{3}\b')
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+class RateLimiter:
+    """Keep at least `interval` seconds between consecutive requests"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.last = 0.0
+
+    def wait(self):
+        delay = self.last + self.interval - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self.last = time.monotonic()
+
+def fetch(url, rate_limiter, retries=3, timeout=30):
+    """Fetch a listing page, retrying rate-limit and server errors"""
+    for attempt in range(retries + 1):
+        rate_limiter.wait()
+        try:
+            request = Request(url, headers={'User-Agent': USER_AGENT}) if url.startswith('http') else url
+            with urlopen(request, timeout=timeout) as response:
+                return response.read().decode('utf-8', errors='replace')
+        except HTTPError as e:
+            if e.code == 404:
+                return ''
+            if e.code != 429 and e.code < 500 or attempt == retries:
+                raise
+            retry_after = e.headers.get('Retry-After', '')
+            backoff = float(retry_after) if retry_after.isdigit() else 2 ** attempt * rate_limiter.interval
+            print(f"HTTP {e.code} for {url}, retrying in {backoff:.0f}s")
+            time.sleep(backoff)
+        except FileNotFoundError:
+            # Recorded stand-in: a missing page is the end of the listing
+            return ''
+        except URLError as e:
+            if isinstance(e.reason, FileNotFoundError):
+                return ''
+            if attempt == retries:
+                raise
+            time.sleep(2 ** attempt * rate_limiter.interval)
+    return ''
+
+def extract_identifiers(body):
+    """Project identifiers in a listing page, in order of appearance"""
+    return list(dict.fromkeys(IDENTIFIER_PATTERN.findall(body)))
+
+def crawl_listing(listing_url, per_page=PER_PAGE, interval=1.0, max_pages=None,
+                  record_dir=None, first_page=1):
+    """Page through the listing until a page adds no new identifiers
+
+    Raises RuntimeError if the first page has no identifiers at all: that
+    means the listing URL is wrong, not that there is nothing to discover.
+
+    Against the recorded fixture, diffed with its two-row catalogue:
+
+    >>> import shutil, tempfile
+    >>> fixtures = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'discovery')
+    >>> listing = 'file://' + os.path.join(fixtures, 'page_{page}.txt')
+    >>> discovered = crawl_listing(listing, interval=0)
+    Page 1: 3 new identifiers
+    Page 2: 1 new identifiers
+    Page 3: 0 new identifiers
+    >>> discovered
+    ['P-ZW-AAG-008', 'P-EG-AAC-007', 'P-KE-AAF-001', 'G-Z1-AA0-SUP-002']
+    >>> catalogue = os.path.join(tempfile.mkdtemp(), 'catalogue.csv')
+    >>> _ = shutil.copy(os.path.join(fixtures, 'catalogue.csv'), catalogue)
+    >>> known = catalogue_identifiers(catalogue)
+    >>> new = [identifier for identifier in discovered if identifier not in known]
+    >>> new
+    ['P-KE-AAF-001', 'G-Z1-AA0-SUP-002']
+    >>> append_to_catalogue([{'project_id': identifier, 'url': project_url(identifier)} for identifier in new], catalogue)
+    >>> sorted(catalogue_identifiers(catalogue))
+    ['G-Z1-AA0-SUP-002', 'P-EG-AAC-007', 'P-KE-AAF-001', 'P-ZW-AAG-008']
+    >>> with open(catalogue, encoding='utf-8') as f:
+    ...     row = list(csv.DictReader(f))[-1]
+    >>> row['status'], row['notes'], row['general_description']
+    ('discovered', 'found by discover_projects.py', '')
+    >>> shutil.rmtree(os.path.dirname(catalogue))
+    """
+    rate_limiter = RateLimiter(interval)
+    seen = {}
+    page = first_page
+
+    while max_pages is None or page < first_page + max_pages:
+        url = listing_url.format(page=page, per_page=per_page)
+        body = fetch(url, rate_limiter)
+        if record_dir:
+            os.makedirs(record_dir, exist_ok=True)
+            with open(os.path.join(record_dir, f'page_{page}.txt'), 'w', encoding='utf-8') as f:
+                f.write(body)
+
+        new = [identifier for identifier in extract_identifiers(body) if identifier not in seen]
+        print(f"Page {page}: {len(new)} new identifiers")
+        if not new and page == first_page:
+            raise RuntimeError(f"No project identifiers found on {url}; check the listing URL")
+        if not new:
+            break
+        for identifier in new:
+            seen[identifier] = page
+        page += 1
+
+    return list(seen)
+
+def catalogue_identifiers(csv_filename=CSV_FILENAME):
+    with open(csv_filename, 'r', encoding='utf-8') as f:
+        return {row.get('Identifier') for row in csv.DictReader(f)}
+
+def append_to_catalogue(projects, csv_filename=CSV_FILENAME):
+    """Append discovered projects as catalogue rows with empty text columns"""
+    with open(csv_filename, 'r', encoding='utf-8', newline='') as f:
+        fieldnames = csv.DictReader(f).fieldnames
+    with open(csv_filename, 'a', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
+        for project in projects:
+            writer.writerow({
+                'Identifier': project['project_id'],
+                'project_url': project['url'],
+                'status': 'discovered',
+                'notes': 'found by discover_projects.py'
+            })
+
+def discover_projects(listing_url, csv_filename=CSV_FILENAME, output_filename=DISCOVERED_FILENAME,
+                      interval=1.0, max_pages=None, record_dir=None, append=False, enqueue_port=None):
+    """Crawl the listing, diff against the catalogue and hand new projects on"""
+    discovered = crawl_listing(listing_url, interval=interval, max_pages=max_pages, record_dir=record_dir)
+    known = catalogue_identifiers(csv_filename)
+    projects = [{'project_id': identifier, 'url': project_url(identifier)}
+                for identifier in discovered if identifier not in known]
+
+    print(f"\nListed {len(discovered)} projects, {len(projects)} not in {csv_filename}")
+    with open(output_filename, 'w', encoding='utf-8') as f:
+        json.dump(projects, f, indent=2)
+    print(f"New projects saved to {output_filename}")
+
+    if projects and append:
+        append_to_catalogue(projects, csv_filename)
+        print(f"Appended {len(projects)} rows to {csv_filename}")
+
+    if projects and enqueue_port:
+        try:
+            response = submit(project_ids=[project['project_id'] for project in projects], port=enqueue_port)
+            print(f"Queued {len(response['jobs'])} scan jobs on port {enqueue_port}")
+        except (URLError, ConnectionError) as e:
+            print(f"Could not reach the scan service on port {enqueue_port}: {e}")
+
+    return projects
+
+def main():
+    parser = argparse.ArgumentParser(description='Discover new AfDB projects from the portal listing')
+    parser.add_argument('--listing-url', required=True,
+                        help='listing URL template with {page} and {per_page}, e.g. '
+                             'file:///path/to/fixtures/discovery/page_{page}.txt for a recording')
+    parser.add_argument('--interval', type=float, default=1.0, help='minimum seconds between requests')
+    parser.add_argument('--max-pages', type=int, help='stop after this many pages')
+    parser.add_argument('--record', help='save each fetched page into this directory')
+    parser.add_argument('--append', action='store_true', help='append new projects to the catalogue CSV')
+    parser.add_argument('--enqueue', type=int, metavar='PORT', help='queue new projects on the scan service at PORT')
+    args = parser.parse_args()
+
+    try:
+        discover_projects(args.listing_url, interval=args.interval, max_pages=args.max_pages,
+                          record_dir=args.record, append=args.append, enqueue_port=args.enqueue)
+    except RuntimeError as e:
+        sys.exit(f"❌ {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Compact evidence encoding for PAD results.
+
+check_for_pad used to store every keyword match as a full
+"Found '<keyword>' in context: ...<200 characters of HTML>..." string, and the
+same few Vue snippets were repeated across every project and every progress
+snapshot. Compact evidence items are small lists instead:
+
+    [keyword, offset, snippet_id]
+
+keyword is the matched PAD keyword, offset is the match position in the page
+source (None for evidence converted from legacy files), and snippet_id
+references a deduplicated context snippet in pad_snippets.json. Neither ID
+depends on what a particular store has seen, so result files written by
+different processes (scan, resume, the scan service) expand against one
+shared store, and save_snippet_store merges with the file on disk instead of
+overwriting it. expand_evidence turns compact items back into the original
+strings, so the encoding is lossless. Plain strings (legacy or fast-path evidence such as
+"Found 'appraisal report' 2 times") pass through both directions unchanged.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+
+SNIPPETS_FILENAME = 'pad_snippets.json'
+
+EVIDENCE_PATTERN = re.compile(r"^Found '(.+?)' in context: \.\.\.(.*)\.\.\.$", re.DOTALL)
+
+def format_evidence(keyword, context):
+    """The human-readable evidence string for a keyword match"""
+    return f"Found '{keyword}' in context: ...{context}..."
+
+def snippet_id(context):
+    """Content-addressed ID, stable across runs and result files"""
+    return hashlib.sha1(context.encode('utf-8')).hexdigest()[:12]
+
+def new_snippet_store():
+    return {'snippets': {}}
+
+def load_snippet_store(filename=SNIPPETS_FILENAME):
+    """Load the snippet store, or an empty one if the file does not exist"""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            store = json.load(f)
+    except FileNotFoundError:
+        return new_snippet_store()
+    store.setdefault('snippets', {})
+    return store
+
+def save_snippet_store(store, filename=SNIPPETS_FILENAME):
+    """Merge the store into the file on disk and write it atomically
+
+    Snippets are content-addressed, so the union of what every process has
+    seen is always consistent. The merged snippets are also added to store.
+    """
+    on_disk = load_snippet_store(filename)
+    store['snippets'] = {**on_disk['snippets'], **store['snippets']}
+
+    temp_filename = f'{filename}.{os.getpid()}.tmp'
+    with open(temp_filename, 'w', encoding='utf-8') as f:
+        json.dump(store, f, indent=2)
+    os.replace(temp_filename, filename)
+
+def add_evidence(store, keyword, offset, context):
+    """Record one keyword match and return its compact evidence item"""
+    sid = snippet_id(context)
+    store['snippets'].setdefault(sid, context)
+    return [keyword, offset, sid]
+
+def is_compact(item):
+    return isinstance(item, list)
+
+def compact_evidence(evidence, store):
+    """Convert evidence strings to compact items where they follow the standard format"""
+    compacted = []
+    for item in evidence:
+        match = EVIDENCE_PATTERN.match(item) if isinstance(item, str) else None
+        if match:
+            compacted.append(add_evidence(store, match.group(1), None, match.group(2)))
+        else:
+            compacted.append(item)
+    return compacted
+
+def expand_evidence(evidence, store):
+    """Convert compact evidence items back to the original strings"""
+    expanded = []
+    for item in evidence:
+        if not is_compact(item):
+            expanded.append(item)
+            continue
+        keyword, _, sid = item
+        try:
+            expanded.append(format_evidence(keyword, store['snippets'][sid]))
+        except KeyError:
+            raise ValueError(f"Evidence {item} not found in snippet store") from None
+    return expanded
+
+def save_results(results, filename):
+    """Write a result list as a JSON array with one compact record per line
+
+    Indenting compact items would put every scalar on its own line and
+    give back most of the space they save.
+    """
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write('[\n')
+        f.write(',\n'.join(json.dumps(result, separators=(',', ':')) for result in results))
+        f.write('\n]\n')
+
+def compact_results(results, store):
+    """Copy of a result list with compact evidence"""
+    return [dict(result, evidence=compact_evidence(result.get('evidence', []), store))
+            for result in results]
+
+def expand_results(results, store):
+    """Copy of a result list with evidence expanded back to strings"""
+    return [dict(result, evidence=expand_evidence(result.get('evidence', []), store))
+            for result in results]
+
+def main():
+    """Convert result files between legacy and compact evidence in place"""
+    parser = argparse.ArgumentParser(description='Compact or expand evidence in PAD result files')
+    parser.add_argument('files', nargs='+', help='result JSON files to convert in place')
+    parser.add_argument('--expand', action='store_true', help='expand compact evidence back to strings')
+    parser.add_argument('--store', default=SNIPPETS_FILENAME, help='snippet store file')
+    args = parser.parse_args()
+
+    store = load_snippet_store(args.store)
+    for filename in args.files:
+        with open(filename, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+        if args.expand:
+            results = expand_results(results, store)
+        else:
+            results = compact_results(results, store)
+        save_results(results, filename)
+        print(f"{'Expanded' if args.expand else 'Compacted'} {len(results)} results in {filename}")
+
+    if not args.expand:
+        save_snippet_store(store, args.store)
+        print(f"Snippet store saved to {args.store} ({len(store['snippets'])} snippets)")
+
+if __name__ == "__main__":
+    main()
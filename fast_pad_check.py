@@ -1,86 +1,19 @@
 #!/usr/bin/env python3
-import csv
-import json
 import time
-import requests
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-import re
+from check_all_pads import check_for_pad, create_driver, read_csv_urls
+from data_files import CSV_FILENAME, RESULTS_FILENAME, derived_filename
+from evidence_store import load_snippet_store, save_results, save_snippet_store
 
-def check_for_pad_fast(url, project_id):
-    """Faster version of PAD checking with better error handling"""
-    print(f"Checking {project_id}: {url}")
-    
-    try:
-        # Set up Chrome options for faster operation
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-images")  # Don't load images
-        chrome_options.add_argument("--disable-javascript")  # Disable JS if possible
-        chrome_options.add_argument("--window-size=800,600")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
-        chrome_options.binary_location = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
-        
-        # Initialize the driver
-        driver = webdriver.Chrome(options=chrome_options)
-        
-        try:
-            # Navigate to the URL with shorter timeout
-            driver.set_page_load_timeout(30)
-            driver.get(url)
-            
-            # Wait less time for page to load
-            time.sleep(2)
-            
-            # Get the page source
-            page_source = driver.page_source
-            
-            # Quick check for PAD-related content
-            pad_keywords = ["appraisal report", "project appraisal document"]
-            
-            found_pad = False
-            pad_evidence = []
-            
-            for keyword in pad_keywords:
-                if re.search(keyword, page_source, re.IGNORECASE):
-                    found_pad = True
-                    # Just count occurrences, don't extract context
-                    matches = len(re.findall(keyword, page_source, re.IGNORECASE))
-                    pad_evidence.append(f"Found '{keyword}' {matches} times")
-                    break  # Found one, that's enough
-            
-            if found_pad:
-                print(f"✅ PAD FOUND in {project_id}")
-                return True, pad_evidence, []
-            else:
-                print(f"❌ No PAD found in {project_id}")
-                return False, [], []
-                
-        finally:
-            driver.quit()
-            
-    except Exception as e:
-        print(f"❌ Error checking {project_id}: {str(e)}")
-        return False, [], []
+# Seconds a page gets to render; the full scan waits 5
+FAST_WAIT = 2
 
-def resume_analysis(start_index=400, batch_size=100):
+def resume_analysis(start_index=400, batch_size=100, csv_filename=CSV_FILENAME,
+                    results_filename=RESULTS_FILENAME, block_resources=True):
     """Resume analysis from a specific point"""
     
-    # Read URLs from CSV
-    all_urls = []
-    try:
-        with open("afdb_full_extraction_with_keywords.csv", 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                if row.get('project_url'):
-                    project_id = row.get('Identifier', 'Unknown')
-                    all_urls.append((project_id, row['project_url']))
-    except Exception as e:
-        print(f"Error reading CSV file: {str(e)}")
+    # Read URLs from CSV (one canonical URL per project)
+    all_urls = read_csv_urls(csv_filename)
+    if not all_urls:
         return
     
     print(f"Found {len(all_urls)} URLs in CSV file")
@@ -94,12 +27,21 @@ def resume_analysis(start_index=400, batch_size=100):
     print("=" * 80)
     
     results = []
+    snippet_store = load_snippet_store()
+    
+    # One warm driver for the whole batch; same cascade as the full scan,
+    # only the render wait and page load timeout are shorter
+    driver = None
     
     for i, (project_id, url) in enumerate(urls_to_check, start_index + 1):
         print(f"\n[{i}/{len(all_urls)}] ", end="")
         
         try:
-            has_pad, evidence, document_links = check_for_pad_fast(url, project_id)
+            if driver is None:
+                driver = create_driver(block_resources)
+                driver.set_page_load_timeout(30)
+            has_pad, evidence, document_links = check_for_pad(url, project_id, snippet_store,
+                                                              driver=driver, wait=FAST_WAIT)
             
             results.append({
                 'project_id': project_id,
@@ -110,6 +52,13 @@ def resume_analysis(start_index=400, batch_size=100):
             
         except Exception as e:
             print(f"❌ Error processing {project_id}: {str(e)}")
+            # Start a fresh browser for the next project
+            if driver is not None:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+                driver = None
             results.append({
                 'project_id': project_id,
                 'url': url,
@@ -124,8 +73,11 @@ def resume_analysis(start_index=400, batch_size=100):
         # Save progress every 25 URLs
         if i % 25 == 0:
             print(f"\n--- Progress saved at {i} URLs ---")
-            with open(f'pad_results_fast_{i}.json', 'w') as f:
-                json.dump(results, f, indent=2)
+            save_results(results, derived_filename(results_filename, f'fast_{i}'))
+            save_snippet_store(snippet_store)
+    
+    if driver is not None:
+        driver.quit()
     
     # Summary for this batch
     projects_with_pad = [r for r in results if r['has_pad']]
@@ -139,9 +91,9 @@ def resume_analysis(start_index=400, batch_size=100):
     print(f"Success rate: {len(projects_with_pad)/len(results)*100:.1f}%")
     
     # Save batch results
-    batch_filename = f"pad_results_fast_batch_{start_index+1}_{end_index}.json"
-    with open(batch_filename, 'w') as f:
-        json.dump(results, f, indent=2)
+    batch_filename = derived_filename(results_filename, f"fast_batch_{start_index+1}_{end_index}")
+    save_results(results, batch_filename)
+    save_snippet_store(snippet_store)
     
     print(f"\nBatch results saved to {batch_filename}")
     
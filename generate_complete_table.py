@@ -7,6 +7,9 @@ import json
 import csv
 import re
 from pathlib import Path
+from data_files import CSV_FILENAME, RESULTS_FILENAME, result_files
+from evidence_store import SNIPPETS_FILENAME, expand_results, load_snippet_store
+from result_stream import iter_latest_results
 
 def extract_country_from_project_id(project_id):
     """Extract country code from project ID"""
@@ -16,6 +19,14 @@ def extract_country_from_project_id(project_id):
             return parts[1]
     return "Unknown"
 
+def extract_sector_from_project_id(project_id):
+    """Extract sector code from project ID (e.g. AAG in P-ZW-AAG-008)"""
+    if project_id.startswith('P-'):
+        parts = project_id.split('-')
+        if len(parts) >= 4:
+            return parts[2]
+    return "Unknown"
+
 def get_country_name(country_code):
     """Get full country name from country code"""
     country_mapping = {
@@ -29,15 +40,15 @@ def get_country_name(country_code):
     }
     return country_mapping.get(country_code, country_code)
 
-def load_pad_results():
-    """Load PAD analysis results from JSON file"""
-    with open('pad_results.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
+def load_pad_results(filename=RESULTS_FILENAME, snippets_filename=SNIPPETS_FILENAME):
+    """Load PAD analysis results (with batch outputs), expanding compact evidence"""
+    fields = ('project_id', 'url', 'has_pad', 'evidence')
+    return expand_results(iter_latest_results(result_files(filename), fields), load_snippet_store(snippets_filename))
 
-def load_project_descriptions():
+def load_project_descriptions(filename=CSV_FILENAME):
     """Load project descriptions from CSV file"""
     descriptions = {}
-    with open('afdb_full_extraction_with_keywords.csv', 'r', encoding='utf-8') as f:
+    with open(filename, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
             project_id = row['Identifier']
@@ -47,12 +58,17 @@ def load_project_descriptions():
             }
     return descriptions
 
-def generate_html_table():
+def generate_html_table(results_filename=RESULTS_FILENAME,
+                        catalogue_filename=CSV_FILENAME,
+                        output_prefix='Complete_AfDB_PAD_Analysis_Table',
+                        snippets_filename=SNIPPETS_FILENAME):
     """Generate complete HTML table with all project data"""
+    from rollups import load_rollups, pad_summary
     
     # Load data
-    pad_results = load_pad_results()
-    descriptions = load_project_descriptions()
+    pad_results = load_pad_results(results_filename, snippets_filename)
+    descriptions = load_project_descriptions(catalogue_filename)
+    summary = pad_summary(load_rollups(catalogue_filename, results_filename))
     
     # Process data
     table_data = []
@@ -131,16 +147,16 @@ def generate_html_table():
             <h2>📊 Analysis Summary</h2>
             <div class="summary-stats">
                 <div class="stat-box">
-                    <div class="stat-number">{len(table_data)}</div>
+                    <div class="stat-number">{summary['analyzed']}</div>
                     <div class="stat-label">Total Projects Analyzed</div>
                 </div>
                 <div class="stat-box">
-                    <div class="stat-number">{sum(1 for p in table_data if p['has_pad'])}</div>
-                    <div class="stat-label">Projects WITH PADs ({sum(1 for p in table_data if p['has_pad'])/len(table_data)*100:.1f}%)</div>
+                    <div class="stat-number">{summary['with_pad']}</div>
+                    <div class="stat-label">Projects WITH PADs ({summary['with_pad']/summary['analyzed']*100:.1f}%)</div>
                 </div>
                 <div class="stat-box">
-                    <div class="stat-number">{sum(1 for p in table_data if not p['has_pad'])}</div>
-                    <div class="stat-label">Projects WITHOUT PADs ({sum(1 for p in table_data if not p['has_pad'])/len(table_data)*100:.1f}%)</div>
+                    <div class="stat-number">{summary['without_pad']}</div>
+                    <div class="stat-label">Projects WITHOUT PADs ({summary['without_pad']/summary['analyzed']*100:.1f}%)</div>
                 </div>
                 <div class="stat-box">
                     <div class="stat-number">100%</div>
@@ -323,14 +339,15 @@ def generate_html_table():
 """
     
     # Write to file
-    with open('Complete_AfDB_PAD_Analysis_Table.html', 'w', encoding='utf-8') as f:
+    html_filename = f'{output_prefix}.html'
+    with open(html_filename, 'w', encoding='utf-8') as f:
         f.write(html_content)
     
     print(f"✅ Complete HTML table generated with {len(table_data)} projects!")
-    print("📁 File: Complete_AfDB_PAD_Analysis_Table.html")
+    print(f"📁 File: {html_filename}")
     
     # Also generate a simple CSV version
-    csv_filename = 'Complete_AfDB_PAD_Analysis_Table.csv'
+    csv_filename = f'{output_prefix}.csv'
     with open(csv_filename, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         writer.writerow(['Project ID', 'Country', 'PAD Status', 'URL', 'Description', 'Keywords', 'Evidence'])
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Bulk keyword extraction for the catalogue's "Keywords Found" columns.
+
+The vocabulary is compiled once into a single trie-shaped regular expression
+(a multi-pattern automaton run by the C regex engine) and the text columns are
+scanned in a process pool. Runs are incremental but give the same output as
+a full rescan: the state file keeps the vocabulary and a hash of each row's
+text columns, and only rows that could come out differently are rescanned
+with the full vocabulary, namely rows whose text changed (or was never
+extracted), rows containing a keyword added since the previous run, and rows
+holding a keyword that was removed (a shorter keyword may now match there).
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from data_files import CSV_FILENAME
+from keyword_index import KEYWORD_COLUMNS, parse_keyword_list
+
+STATE_FILENAME = 'afdb_keyword_extraction_state.json'
+
+# Text column -> short keyword column name in KEYWORD_COLUMNS
+TEXT_COLUMNS = ['general_description', 'objectives', 'beneficiaries']
+
+# Rows per task sent to a worker process
+CHUNK_SIZE = 500
+
+# Below this many rows a process pool costs more than it saves
+POOL_THRESHOLD = 2000
+
+# Whitespace and hyphens between words are treated as one separator, so
+# "value  chain" and "value-chain" both match the keyword "value chain"
+SEPARATOR = r'[\s\-]+'
+
+def normalize_keyword(text):
+    """Canonical form used to map a match back to its keyword"""
+    return re.sub(SEPARATOR, ' ', text.strip().lower())
+
+def _trie_regex(node):
+    """Turn a character trie into an alternation that prefers longer matches"""
+    alternatives = []
+    for char in sorted(key for key in node if key):
+        token = SEPARATOR if char == ' ' else re.escape(char)
+        alternatives.append(token + _trie_regex(node[char]))
+
+    if not alternatives:
+        return ''
+    optional = '' in node
+    if len(alternatives) == 1 and not optional:
+        return alternatives[0]
+    body = '(?:' + '|'.join(alternatives) + ')'
+    return body + '?' if optional else body
+
+def compile_vocabulary(vocabulary):
+    """Compile a keyword vocabulary into a matcher dict
+
+    Matching is case-insensitive, word-bounded, leftmost-longest and
+    non-overlapping, like the original extraction: text reading "goat meat"
+    yields "goat meat" but not "goat".
+    """
+    keywords = {}
+    for keyword in vocabulary:
+        normalized = normalize_keyword(keyword)
+        if normalized:
+            keywords.setdefault(normalized, keyword)
+
+    if not keywords:
+        return {'pattern': None, 'keywords': {}}
+
+    trie = {}
+    for normalized in keywords:
+        node = trie
+        for char in normalized:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    pattern = re.compile(r'\b(' + _trie_regex(trie) + r')\b', re.IGNORECASE)
+    return {'pattern': pattern, 'keywords': keywords}
+
+def find_keywords(matcher, text):
+    """Set of vocabulary keywords occurring in a piece of text"""
+    if not text or matcher['pattern'] is None:
+        return set()
+    keywords = matcher['keywords']
+    return {keywords[normalize_keyword(match.group(1))] for match in matcher['pattern'].finditer(text)}
+
+_worker_matcher = None
+
+def _init_worker(vocabulary):
+    """Compile the vocabulary once per worker process"""
+    global _worker_matcher
+    _worker_matcher = compile_vocabulary(vocabulary)
+
+def _scan_chunk(texts):
+    """Scan a chunk of (general_description, objectives, beneficiaries) tuples"""
+    return [[sorted(find_keywords(_worker_matcher, text)) for text in row] for row in texts]
+
+def scan_texts(texts, vocabulary, workers=None):
+    """Keyword lists per text column for each row of texts, in a process pool"""
+    if not texts or not vocabulary:
+        return [[[] for _ in row] for row in texts]
+
+    chunks = [texts[i:i + CHUNK_SIZE] for i in range(0, len(texts), CHUNK_SIZE)]
+    if len(texts) < POOL_THRESHOLD or workers == 1:
+        _init_worker(vocabulary)
+        results = [_scan_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(list(vocabulary),)) as executor:
+            results = list(executor.map(_scan_chunk, chunks))
+
+    return [row for chunk in results for row in chunk]
+
+def format_keyword_list(keywords):
+    """Format keywords the way the catalogue stores them: "['a', 'b']" """
+    return str(sorted(keywords))
+
+def load_vocabulary(filename):
+    """Read a vocabulary file, one keyword per line (# starts a comment)"""
+    vocabulary = []
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            keyword = line.split('#', 1)[0].strip()
+            if keyword and keyword not in vocabulary:
+                vocabulary.append(keyword)
+    return vocabulary
+
+def text_hash(texts):
+    """Hash of a row's text columns, used to notice edited rows"""
+    return hashlib.sha1('\x1f'.join(texts).encode('utf-8')).hexdigest()[:16]
+
+def load_state(filename=STATE_FILENAME):
+    """Vocabulary and per-row text hashes of the previous run, or None"""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if 'vocabulary' not in state:
+        return None
+    state.setdefault('rows', {})
+    return state
+
+def save_state(vocabulary, row_hashes, filename=STATE_FILENAME):
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump({'vocabulary': sorted(vocabulary), 'rows': row_hashes}, f, indent=2)
+
+def catalogue_vocabulary(rows):
+    """Every keyword already present in the catalogue's keyword columns"""
+    vocabulary = set()
+    for row in rows:
+        for csv_column in KEYWORD_COLUMNS.values():
+            vocabulary.update(parse_keyword_list(row.get(csv_column, '')))
+    return vocabulary
+
+def extract_keywords(input_filename=CSV_FILENAME, output_filename=None, vocabulary=None,
+                     state_filename=STATE_FILENAME, full=False, workers=None):
+    """(Re)generate the four "Keywords Found" columns of the catalogue
+
+    Args:
+        input_filename (str): Catalogue CSV to read
+        output_filename (str): CSV to write (defaults to the input file)
+        vocabulary (list): Keywords to extract; defaults to the previous run's
+            vocabulary, or to the keywords already present in the catalogue
+        state_filename (str): Where the vocabulary of the last run is kept
+        full (bool): Rescan every row with the whole vocabulary
+        workers (int): Process pool size (defaults to the CPU count)
+    """
+    output_filename = output_filename or input_filename
+
+    with open(input_filename, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        fieldnames = list(reader.fieldnames)
+        rows = list(reader)
+
+    for csv_column in KEYWORD_COLUMNS.values():
+        if csv_column not in fieldnames:
+            fieldnames.append(csv_column)
+
+    state = load_state(state_filename)
+    if state is None:
+        # First run: trust the keyword columns that are already filled in
+        previous = sorted(catalogue_vocabulary(rows))
+        previous_hashes = None
+    else:
+        previous = state['vocabulary']
+        previous_hashes = state['rows']
+    vocabulary = list(vocabulary) if vocabulary is not None else list(previous)
+
+    previous_set = set(previous)
+    added = [keyword for keyword in vocabulary if keyword not in previous_set]
+    removed = previous_set - set(vocabulary)
+
+    text_columns = [KEYWORD_COLUMNS[column] for column in TEXT_COLUMNS]
+    texts = [tuple(row.get(column, '') or '' for column in TEXT_COLUMNS) for row in rows]
+    row_ids = [row.get('Identifier') or str(i) for i, row in enumerate(rows)]
+    row_hashes = [text_hash(row_texts) for row_texts in texts]
+
+    if full:
+        changed = set(range(len(rows)))
+    else:
+        changed = {i for i, row in enumerate(rows)
+                   if any(not row.get(csv_column, '').strip() for csv_column in text_columns)
+                   or (previous_hashes is not None and previous_hashes.get(row_ids[i]) != row_hashes[i])}
+    unchanged = [i for i in range(len(rows)) if i not in changed]
+
+    # Rows holding a removed keyword may match a shorter keyword instead
+    with_removed = {i for i in unchanged if removed and any(
+        keyword in removed for csv_column in text_columns
+        for keyword in parse_keyword_list(rows[i].get(csv_column, '')))}
+
+    # Rows mentioning an added keyword are rescanned with the whole
+    # vocabulary, so the added keyword only wins where it is the longest match
+    with_added = set()
+    if added:
+        probe = scan_texts([texts[i] for i in unchanged], added, workers)
+        with_added = {i for i, found in zip(unchanged, probe) if any(found)}
+
+    rescan = sorted(changed | with_removed | with_added)
+    print(f"Vocabulary: {len(vocabulary)} keywords ({len(added)} added, {len(removed)} removed)")
+    print(f"Rows to scan: {len(rescan)} ({len(changed)} new or edited, {len(with_added - changed)} with added "
+          f"keywords, {len(with_removed - changed)} with removed keywords)")
+
+    for i, found in zip(rescan, scan_texts([texts[i] for i in rescan], vocabulary, workers)):
+        for csv_column, keywords in zip(text_columns, found):
+            rows[i][csv_column] = format_keyword_list(keywords)
+
+    any_column = KEYWORD_COLUMNS['any']
+    for row in rows:
+        keywords = set()
+        for csv_column in text_columns:
+            keywords.update(parse_keyword_list(row[csv_column]))
+        row[any_column] = format_keyword_list(keywords)
+
+    temp_filename = output_filename + '.tmp'
+    with open(temp_filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(temp_filename, output_filename)
+    save_state(vocabulary, dict(zip(row_ids, row_hashes)), state_filename)
+
+    print(f"Keyword columns written to {output_filename}")
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate the catalogue's Keywords Found columns")
+    parser.add_argument('--input', default=CSV_FILENAME, help='catalogue CSV to read')
+    parser.add_argument('--output', help='CSV to write (defaults to --input)')
+    parser.add_argument('--vocabulary', help='keyword file, one keyword per line')
+    parser.add_argument('--full', action='store_true', help='rescan every row with the whole vocabulary')
+    parser.add_argument('--workers', type=int, help='number of worker processes')
+    args = parser.parse_args()
+
+    vocabulary = load_vocabulary(args.vocabulary) if args.vocabulary else None
+    extract_keywords(args.input, args.output, vocabulary, full=args.full, workers=args.workers)
+
+if __name__ == "__main__":
+    main()
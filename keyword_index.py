@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Compact keyword index over the catalogue's "Keywords Found" columns.
+
+The CSV stores each keyword column as a stringified Python list. This module
+parses them once into an interned vocabulary with one bitset per keyword and
+column (bit i set = project row i has the keyword), and caches the result in
+a small binary sidecar next to the CSV. Queries are then bitwise set
+operations instead of string scans over every row.
+"""
+
+import ast
+import csv
+import os
+import struct
+import zlib
+from itertools import combinations
+
+from data_files import CSV_FILENAME, RESULTS_FILENAME, result_files, source_signature
+from generate_complete_table import extract_country_from_project_id
+from result_stream import iter_latest_results
+
+INDEX_FILENAME = 'afdb_keyword_index.bin'
+
+# Short column name -> CSV column holding its stringified keyword list
+KEYWORD_COLUMNS = {
+    'general_description': 'Keywords Found in general_description',
+    'objectives': 'Keywords Found in objectives',
+    'beneficiaries': 'Keywords Found in beneficiaries',
+    'any': 'Keywords Found (Any Column)'
+}
+
+INDEX_MAGIC = b'AFKI'
+INDEX_VERSION = 1
+
+def parse_keyword_list(value):
+    """Parse a stringified keyword list such as "['beef', 'leather']" """
+    if not value or not value.strip():
+        return []
+    try:
+        keywords = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return []
+    return [str(keyword) for keyword in keywords] if isinstance(keywords, (list, tuple)) else []
+
+def build_keyword_index(csv_filename=CSV_FILENAME):
+    """Parse the keyword columns of the catalogue into an index dict"""
+    project_ids = []
+    vocabulary = []
+    keyword_ids = {}
+    postings = {column: [] for column in KEYWORD_COLUMNS}
+
+    with open(csv_filename, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row_index, row in enumerate(reader):
+            project_ids.append(row.get('Identifier', 'Unknown'))
+            bit = 1 << row_index
+            for column, csv_column in KEYWORD_COLUMNS.items():
+                for keyword in parse_keyword_list(row.get(csv_column, '')):
+                    keyword_id = keyword_ids.get(keyword)
+                    if keyword_id is None:
+                        keyword_id = keyword_ids[keyword] = len(vocabulary)
+                        vocabulary.append(keyword)
+                        for bitsets in postings.values():
+                            bitsets.append(0)
+                    postings[column][keyword_id] |= bit
+
+    return {
+        'project_ids': project_ids,
+        'vocabulary': vocabulary,
+        'keyword_ids': keyword_ids,
+        'project_rows': {project_id: i for i, project_id in enumerate(project_ids)},
+        'postings': postings
+    }
+
+def _pack_strings(strings):
+    return b''.join(struct.pack('<H', len(encoded)) + encoded
+                    for encoded in (s.encode('utf-8') for s in strings))
+
+def _unpack_strings(data, offset, count):
+    strings = []
+    for _ in range(count):
+        (length,) = struct.unpack_from('<H', data, offset)
+        offset += 2
+        strings.append(data[offset:offset + length].decode('utf-8'))
+        offset += length
+    return strings, offset
+
+def save_keyword_index(index, index_filename=INDEX_FILENAME, csv_filename=CSV_FILENAME):
+    """Write the index to a zlib-compressed binary sidecar"""
+    project_ids = index['project_ids']
+    vocabulary = index['vocabulary']
+    columns = list(index['postings'])
+    bitset_bytes = (len(project_ids) + 7) // 8
+
+    body = [
+        struct.pack('<III', len(project_ids), len(vocabulary), len(columns)),
+        _pack_strings(project_ids),
+        _pack_strings(vocabulary),
+        _pack_strings(columns)
+    ]
+    for column in columns:
+        for bitset in index['postings'][column]:
+            body.append(bitset.to_bytes(bitset_bytes, 'little'))
+
+    size, mtime_ns = source_signature(csv_filename)
+    with open(index_filename, 'wb') as f:
+        f.write(INDEX_MAGIC + struct.pack('<BQQ', INDEX_VERSION, size, mtime_ns))
+        f.write(zlib.compress(b''.join(body), 9))
+
+def read_keyword_index(index_filename=INDEX_FILENAME, csv_filename=None):
+    """Read a sidecar; returns None if missing, invalid or older than csv_filename"""
+    try:
+        with open(index_filename, 'rb') as f:
+            header = f.read(len(INDEX_MAGIC) + 17)
+            payload = f.read()
+    except OSError:
+        return None
+
+    if len(header) < len(INDEX_MAGIC) + 17 or header[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+        return None
+    version, size, mtime_ns = struct.unpack_from('<BQQ', header, len(INDEX_MAGIC))
+    if version != INDEX_VERSION:
+        return None
+    if csv_filename and [size, mtime_ns] != source_signature(csv_filename):
+        return None
+
+    data = zlib.decompress(payload)
+    n_projects, n_keywords, n_columns = struct.unpack_from('<III', data, 0)
+    project_ids, offset = _unpack_strings(data, 12, n_projects)
+    vocabulary, offset = _unpack_strings(data, offset, n_keywords)
+    columns, offset = _unpack_strings(data, offset, n_columns)
+
+    bitset_bytes = (n_projects + 7) // 8
+    postings = {}
+    for column in columns:
+        bitsets = []
+        for _ in range(n_keywords):
+            bitsets.append(int.from_bytes(data[offset:offset + bitset_bytes], 'little'))
+            offset += bitset_bytes
+        postings[column] = bitsets
+
+    return {
+        'project_ids': project_ids,
+        'vocabulary': vocabulary,
+        'keyword_ids': {keyword: i for i, keyword in enumerate(vocabulary)},
+        'project_rows': {project_id: i for i, project_id in enumerate(project_ids)},
+        'postings': postings
+    }
+
+def load_keyword_index(csv_filename=CSV_FILENAME, index_filename=INDEX_FILENAME):
+    """Load the sidecar index, rebuilding it if it is missing or stale"""
+    index = read_keyword_index(index_filename, csv_filename)
+    if index is None:
+        index = build_keyword_index(csv_filename)
+        save_keyword_index(index, index_filename, csv_filename)
+    return index
+
+def iter_bits(bitset):
+    """Yield the row numbers set in a bitset"""
+    while bitset:
+        low = bitset & -bitset
+        yield low.bit_length() - 1
+        bitset ^= low
+
+def keyword_bitset(index, keyword, column='any'):
+    """Bitset of projects having a keyword in the given column"""
+    keyword_id = index['keyword_ids'].get(keyword)
+    if keyword_id is None:
+        return 0
+    return index['postings'][column][keyword_id]
+
+def projects_in(index, bitset):
+    """Project IDs for the rows set in a bitset"""
+    project_ids = index['project_ids']
+    return [project_ids[row] for row in iter_bits(bitset)]
+
+def keywords_for_project(index, project_id, column='any'):
+    """Keywords recorded for one project, in vocabulary order"""
+    row = index['project_rows'].get(project_id)
+    if row is None:
+        return []
+    bit = 1 << row
+    return [keyword for keyword, bitset in zip(index['vocabulary'], index['postings'][column])
+            if bitset & bit]
+
+def pad_bitset(index, pad_results):
+    """Bitset of projects marked has_pad in a list of PAD results"""
+    rows = index['project_rows']
+    bitset = 0
+    for result in pad_results:
+        row = rows.get(result['project_id'])
+        if row is not None and result.get('has_pad'):
+            bitset |= 1 << row
+    return bitset
+
+def country_bitsets(index):
+    """Bitset of projects per country code"""
+    countries = {}
+    for row, project_id in enumerate(index['project_ids']):
+        country_code = extract_country_from_project_id(project_id)
+        countries[country_code] = countries.get(country_code, 0) | (1 << row)
+    return countries
+
+def count_by_country(index, bitset):
+    """Number of projects in a bitset per country code (non-zero only)"""
+    counts = {}
+    for country_code, country_mask in country_bitsets(index).items():
+        count = (bitset & country_mask).bit_count()
+        if count:
+            counts[country_code] = count
+    return counts
+
+def keyword_counts(index, column='any', mask=None):
+    """Number of projects per keyword, optionally restricted to a mask"""
+    return {keyword: (bitset & mask if mask is not None else bitset).bit_count()
+            for keyword, bitset in zip(index['vocabulary'], index['postings'][column])}
+
+def cooccurrence_counts(index, column='any', mask=None):
+    """Number of projects sharing each pair of keywords (non-zero pairs only)"""
+    bitsets = index['postings'][column]
+    if mask is not None:
+        bitsets = [bitset & mask for bitset in bitsets]
+    vocabulary = index['vocabulary']
+
+    counts = {}
+    for a, b in combinations(range(len(vocabulary)), 2):
+        count = (bitsets[a] & bitsets[b]).bit_count()
+        if count:
+            counts[(vocabulary[a], vocabulary[b])] = count
+    return counts
+
+def main():
+    """Load the keyword index (rebuilding a stale sidecar) and print a short summary"""
+    index = load_keyword_index(CSV_FILENAME, INDEX_FILENAME)
+    print(f"Indexed {len(index['vocabulary'])} keywords over {len(index['project_ids'])} projects")
+    print(f"Index sidecar {INDEX_FILENAME} ({os.path.getsize(INDEX_FILENAME)} bytes)")
+
+    mask = None
+    if os.path.exists(RESULTS_FILENAME):
+        mask = pad_bitset(index, iter_latest_results(result_files(RESULTS_FILENAME), fields=('project_id', 'has_pad')))
+        print(f"Projects with PADs: {mask.bit_count()}")
+
+    print("\nTop keywords" + (" (projects with PADs)" if mask is not None else "") + ":")
+    for keyword, count in sorted(keyword_counts(index, mask=mask).items(), key=lambda item: -item[1])[:10]:
+        print(f"  {keyword}: {count}")
+
+    print("\nTop keyword pairs:")
+    for (a, b), count in sorted(cooccurrence_counts(index, mask=mask).items(), key=lambda item: -item[1])[:10]:
+        print(f"  {a} + {b}: {count}")
+
+if __name__ == "__main__":
+    main()
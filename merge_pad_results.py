@@ -1,7 +1,11 @@
 import pandas as pd
-import json
+from data_files import CSV_FILENAME, RESULTS_FILENAME, result_files
+from result_stream import iter_latest_results
+from rollups import load_rollups, pad_summary
 
-def merge_pad_results():
+def merge_pad_results(csv_filename=CSV_FILENAME,
+                      results_filename=RESULTS_FILENAME,
+                      output_filename='afdb_projects_with_pad_status.csv'):
     """
     Merge the original CSV file with PAD analysis results and add a new column
     indicating whether each project has PAD documents available.
@@ -9,17 +13,14 @@ def merge_pad_results():
     
     # Load the original CSV file
     print("Loading original CSV file...")
-    df_original = pd.read_csv('afdb_full_extraction_with_keywords.csv')
+    df_original = pd.read_csv(csv_filename)
     print(f"Original CSV has {len(df_original)} rows")
     
     # Load the PAD analysis results
     print("Loading PAD analysis results...")
-    with open('pad_results.json', 'r', encoding='utf-8') as f:
-        pad_results = json.load(f)
-    
     # Create a dictionary mapping project_id to has_pad status
     pad_status = {}
-    for result in pad_results:
+    for result in iter_latest_results(result_files(results_filename), fields=('project_id', 'has_pad')):
         project_id = result['project_id']
         has_pad = result['has_pad']
         pad_status[project_id] = has_pad
@@ -41,7 +42,6 @@ def merge_pad_results():
     })
     
     # Save the merged dataset
-    output_filename = 'afdb_projects_with_pad_status.csv'
     df_original.to_csv(output_filename, index=False)
     
     # Print summary statistics
@@ -49,23 +49,26 @@ def merge_pad_results():
     print("SUMMARY STATISTICS")
     print("="*50)
     
-    pad_counts = df_original['Has_PAD_Documents'].value_counts()
+    # Status counts come from the rollup cube instead of value_counts passes
+    summary = pad_summary(load_rollups(csv_filename, results_filename))
+    pad_counts = {'Yes': summary['with_pad'], 'No': summary['without_pad'], 'Unknown': summary['unknown']}
     print(f"Total projects in original CSV: {len(df_original)}")
     print(f"Projects with PAD analysis: {len(pad_status)}")
     print(f"Projects without PAD analysis: {len(df_original) - len(pad_status)}")
     print("\nPAD Status Distribution:")
-    for status, count in pad_counts.items():
-        percentage = (count / len(df_original)) * 100
-        print(f"  {status}: {count} ({percentage:.1f}%)")
+    for status, count in sorted(pad_counts.items(), key=lambda item: -item[1]):
+        if count:
+            percentage = (count / len(df_original)) * 100
+            print(f"  {status}: {count} ({percentage:.1f}%)")
     
     # Calculate statistics for projects that were analyzed
-    analyzed_projects = df_original[df_original['Has_PAD_Documents'] != 'Unknown']
-    if len(analyzed_projects) > 0:
-        analyzed_pad_counts = analyzed_projects['Has_PAD_Documents'].value_counts()
-        print(f"\nAnalyzed Projects Only ({len(analyzed_projects)} projects):")
-        for status, count in analyzed_pad_counts.items():
-            percentage = (count / len(analyzed_projects)) * 100
-            print(f"  {status}: {count} ({percentage:.1f}%)")
+    analyzed_count = summary['with_pad'] + summary['without_pad']
+    if analyzed_count > 0:
+        print(f"\nAnalyzed Projects Only ({analyzed_count} projects):")
+        for status in sorted(['Yes', 'No'], key=lambda status: -pad_counts[status]):
+            if pad_counts[status]:
+                percentage = (pad_counts[status] / analyzed_count) * 100
+                print(f"  {status}: {pad_counts[status]} ({percentage:.1f}%)")
     
     print(f"\nMerged dataset saved to: {output_filename}")
     
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Project URL canonicalization and request coalescing.
+
+MapAfrica serves each project under a language prefix
+(https://mapafrica.afdb.org/en/projects/46002-<Identifier>, /fr/..., with or
+without trailing slashes, query strings or fragments). All variants are
+reduced to the project identifier and one canonical (English) URL: a project
+is fetched once no matter how many of its variants were submitted. Document
+URLs are normalised the same way so duplicates collapse before any download
+or classification.
+
+Limitation: only the English page is scanned. This assumes it lists the
+documents in every language, which has not been verified; a PAD linked only
+from the French page would be missed.
+"""
+
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+PORTAL_HOST = 'mapafrica.afdb.org'
+CANONICAL_LANGUAGE = 'en'
+
+PROJECT_URL_TEMPLATE = 'https://mapafrica.afdb.org/{language}/projects/46002-{project_id}'
+PROJECT_PATH_PATTERN = re.compile(r'^/(?:([a-z]{2})/)?projects/46002-([^/]+)/?$', re.IGNORECASE)
+
+# Query parameters that never change what a URL points to
+TRACKING_PARAMETERS = ('utm_', 'fbclid', 'gclid')
+
+def project_url(project_id, language=CANONICAL_LANGUAGE):
+    return PROJECT_URL_TEMPLATE.format(language=language, project_id=project_id)
+
+def project_id_from_url(url):
+    """Identifier of a MapAfrica project page URL, or None for other URLs"""
+    parts = urlsplit(url.strip())
+    if parts.netloc.lower() != PORTAL_HOST:
+        return None
+    match = PROJECT_PATH_PATTERN.match(parts.path)
+    return match.group(2) if match else None
+
+def canonical_project_url(url_or_project_id):
+    """Canonical (English) project page URL for a project URL or identifier"""
+    project_id = project_id_from_url(url_or_project_id) or url_or_project_id.strip()
+    return project_url(project_id)
+
+def canonical_document_url(url):
+    """Normalised document URL used to detect duplicates
+
+    Project pages map to their canonical project URL; other URLs get a
+    lower-case scheme and host, no fragment, no tracking parameters and
+    no trailing slash.
+    """
+    if project_id_from_url(url):
+        return canonical_project_url(url)
+    parts = urlsplit(url.strip())
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not key.lower().startswith(TRACKING_PARAMETERS)]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+def coalesce_projects(targets):
+    """Reduce (project_id, url) pairs to one canonical URL per project, keeping order"""
+    coalesced = {}
+    for project_id, url in targets:
+        project_id = project_id_from_url(url) or project_id
+        if project_id not in coalesced:
+            coalesced[project_id] = canonical_project_url(url if project_id_from_url(url) else project_id)
+    return list(coalesced.items())
+
+def dedupe_document_links(links):
+    """Collapse document links with the same canonical URL, keeping the first"""
+    seen = set()
+    deduped = []
+    for link in links:
+        key = (link.get('project_id'), canonical_document_url(link['url']))
+        if key not in seen:
+            seen.add(key)
+            deduped.append(link)
+    return deduped
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Streaming readers for PAD result files.
+
+iter_results yields one record at a time from either a legacy JSON array
+file (pad_results.json, pad_results_progress_*.json, document_links.json)
+or a line-delimited file (one JSON object per line), so consumers run in
+constant memory however large the result set is. Passing fields keeps only
+those keys of each record, e.g. fields=('project_id', 'has_pad').
+"""
+
+import json
+import os
+
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+
+def _project(record, fields):
+    if fields is None:
+        return record
+    return {field: record[field] for field in fields if field in record}
+
+def _iter_json_array(f, chunk_size=CHUNK_SIZE):
+    """Yield the elements of a JSON array without loading the whole file
+
+    f is positioned just after the opening bracket. An element is only
+    accepted once a delimiter follows it, so a number cut off at the end of
+    a chunk is not mistaken for a whole one:
+
+    >>> import io
+    >>> list(_iter_json_array(io.StringIO('1234, 5678, 91011]'), chunk_size=3))
+    [1234, 5678, 91011]
+    >>> list(_iter_json_array(io.StringIO(' {"a": [1, 2]}, "x", true, null ]'), chunk_size=2))
+    [{'a': [1, 2]}, 'x', True, None]
+    """
+    buffer = f.read(chunk_size)
+    position = 0
+    eof = not buffer
+
+    while True:
+        # Skip whitespace and separators between elements
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+        if position >= len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of file inside JSON array")
+            buffer = f.read(chunk_size)
+            position = 0
+            eof = not buffer
+            continue
+        if buffer[position] == ']':
+            return
+
+        try:
+            element, end = _decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Element continues past the buffer: keep its start, read more
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        if end == len(buffer) and not eof:
+            # A scalar may continue in the next chunk: decode again with more
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        yield element
+        position = end
+
+def _iter_json_lines(f, first_chunk):
+    """Yield one record per non-empty line"""
+    pending = first_chunk
+    for line in f:
+        line, pending = pending + line, ''
+        if line.strip():
+            yield json.loads(line)
+    if pending.strip():
+        yield json.loads(pending)
+
+def iter_latest_results(filenames, fields=None):
+    """One record per project across several result files
+
+    A project's record from the most recently modified file wins (the
+    earlier file in filenames on a tie, the later record within one file);
+    records are yielded in order of first appearance across filenames.
+    """
+    latest = {}
+    for position, filename in enumerate(filenames):
+        if not os.path.exists(filename):
+            continue
+        mtime = os.stat(filename).st_mtime_ns
+        for record in iter_results(filename, fields):
+            previous = latest.get(record['project_id'])
+            if previous is None or mtime > previous[0] or position == previous[1]:
+                latest[record['project_id']] = (mtime, position, record)
+    for _, _, record in latest.values():
+        yield record
+
+def iter_results(filename, fields=None):
+    """Yield result records from a JSON array or JSON lines file
+
+    Args:
+        filename (str): Result file to read
+        fields (tuple): Keys to keep in each record (None = all)
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        # Sniff the format from the first non-whitespace character
+        first_chunk = ''
+        while True:
+            char = f.read(1)
+            first_chunk += char
+            if not char or not char.isspace():
+                break
+
+        if first_chunk.strip() == '[':
+            records = _iter_json_array(f)
+        else:
+            records = _iter_json_lines(f, first_chunk)
+        for record in records:
+            yield _project(record, fields)
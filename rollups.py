@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Aggregate rollups by country, sector code, PAD status and keyword.
+
+The cube is built in one pass over the catalogue and the PAD results and is
+kept in a small JSON sidecar. Each cell counts projects for one
+(country, sector, status, keyword) combination; keyword '' holds the
+per-project totals, so project counts are never multiplied by the number of
+keywords. set_project updates the cube incrementally as results arrive,
+replacing whatever the project contributed before.
+
+Statuses are 'pad', 'no_pad', 'error' (page could not be checked) and
+'unknown' (in the catalogue but not yet analysed).
+"""
+
+import json
+import sys
+
+from data_files import CSV_FILENAME, RESULTS_FILENAME, result_files, source_signature
+from generate_complete_table import extract_country_from_project_id, extract_sector_from_project_id, get_country_name
+from keyword_index import iter_bits, load_keyword_index
+from result_stream import iter_latest_results
+
+ROLLUPS_FILENAME = 'pad_rollups.json'
+
+DIMENSIONS = ('country', 'sector', 'status', 'keyword')
+
+# Keyword value of the per-project total cells
+ALL_KEYWORDS = ''
+
+def project_status(result):
+    """Rollup status for a PAD result (None = not analysed yet)"""
+    if result is None:
+        return 'unknown'
+    if result.get('error'):
+        return 'error'
+    return 'pad' if result.get('has_pad') else 'no_pad'
+
+def new_cube():
+    return {'projects': {}, 'cells': {}, 'sources': {}}
+
+def _add_cells(cells, project, delta):
+    base = (project['country'], project['sector'], project['status'])
+    for keyword in [ALL_KEYWORDS] + project['keywords']:
+        key = base + (keyword,)
+        count = cells.get(key, 0) + delta
+        if count:
+            cells[key] = count
+        else:
+            cells.pop(key, None)
+
+def set_project(cube, project_id, status, keywords=None):
+    """Add or update one project; keywords=None keeps the known keywords"""
+    previous = cube['projects'].get(project_id)
+    if previous is not None:
+        _add_cells(cube['cells'], previous, -1)
+        if keywords is None:
+            keywords = previous['keywords']
+
+    project = {
+        'country': extract_country_from_project_id(project_id),
+        'sector': extract_sector_from_project_id(project_id),
+        'status': status,
+        'keywords': sorted(set(keywords or []))
+    }
+    cube['projects'][project_id] = project
+    _add_cells(cube['cells'], project, 1)
+
+def add_result(cube, result):
+    """Fold one PAD result into the cube"""
+    set_project(cube, result['project_id'], project_status(result))
+
+def build_cube(index, results):
+    """Build the cube from the keyword index and one pass over PAD results"""
+    cube = new_cube()
+    keywords_by_row = [[] for _ in index['project_ids']]
+    for keyword, bitset in zip(index['vocabulary'], index['postings']['any']):
+        for row in iter_bits(bitset):
+            keywords_by_row[row].append(keyword)
+    for project_id, keywords in zip(index['project_ids'], keywords_by_row):
+        set_project(cube, project_id, 'unknown', keywords)
+    for result in results:
+        add_result(cube, result)
+    return cube
+
+def rollup(cube, by=('status',), keyword=ALL_KEYWORDS, **filters):
+    """Project counts grouped by the given dimensions
+
+    Args:
+        by (tuple): Dimensions to group by, from DIMENSIONS
+        keyword (str): Only count projects with this keyword ('' = all projects)
+        filters: Fixed values for other dimensions, e.g. status='pad'
+    """
+    positions = [DIMENSIONS.index(dimension) for dimension in by]
+    filter_positions = [(DIMENSIONS.index(dimension), value) for dimension, value in filters.items()]
+
+    groups = {}
+    for key, count in cube['cells'].items():
+        if keyword is not None and key[3] != keyword:
+            continue
+        if any(key[position] != value for position, value in filter_positions):
+            continue
+        group = tuple(key[position] for position in positions)
+        groups[group] = groups.get(group, 0) + count
+    return groups
+
+def status_counts(cube):
+    """Number of projects per status"""
+    return {status: count for (status,), count in rollup(cube, by=('status',)).items()}
+
+def pad_summary(cube):
+    """Analysed / with PAD / without PAD totals (errors count as without PAD)"""
+    counts = status_counts(cube)
+    with_pad = counts.get('pad', 0)
+    without_pad = counts.get('no_pad', 0) + counts.get('error', 0)
+    return {
+        'catalogue': sum(counts.values()),
+        'analyzed': with_pad + without_pad,
+        'with_pad': with_pad,
+        'without_pad': without_pad,
+        'errors': counts.get('error', 0),
+        'unknown': counts.get('unknown', 0)
+    }
+
+def save_cube(cube, filename=ROLLUPS_FILENAME):
+    data = {
+        'sources': cube['sources'],
+        'projects': cube['projects'],
+        'cells': [list(key) + [count] for key, count in sorted(cube['cells'].items())]
+    }
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+def read_cube(filename=ROLLUPS_FILENAME):
+    """Read a saved cube, or None if it does not exist"""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return {
+        'sources': data.get('sources', {}),
+        'projects': data['projects'],
+        'cells': {tuple(cell[:4]): cell[4] for cell in data['cells']}
+    }
+
+def _sources(csv_filename, results_filename):
+    return {'catalogue': source_signature(csv_filename),
+            'results': {filename: source_signature(filename) for filename in result_files(results_filename)}}
+
+def save_rollups(cube, csv_filename=CSV_FILENAME, results_filename=RESULTS_FILENAME, filename=ROLLUPS_FILENAME):
+    """Save an incrementally updated cube as matching the current source files"""
+    cube['sources'] = _sources(csv_filename, results_filename)
+    save_cube(cube, filename)
+
+def load_rollups(csv_filename=CSV_FILENAME, results_filename=RESULTS_FILENAME, filename=ROLLUPS_FILENAME):
+    """Load the cube sidecar, rebuilding it if the catalogue or results changed
+
+    Results are read from data_files.result_files(results_filename), the
+    same set every other consumer reads.
+    """
+    sources = _sources(csv_filename, results_filename)
+    cube = read_cube(filename)
+    if cube is not None and cube['sources'] == sources:
+        return cube
+
+    results = iter_latest_results(result_files(results_filename), fields=('project_id', 'has_pad', 'error'))
+
+    if sources['catalogue'] is not None:
+        index = load_keyword_index(csv_filename)
+    else:
+        index = {'project_ids': [], 'vocabulary': [], 'postings': {'any': []}}
+    cube = build_cube(index, results)
+    cube['sources'] = sources
+    save_cube(cube, filename)
+    return cube
+
+def format_key_findings(cube):
+    """Markdown "Key Findings" bullets as used in the README"""
+    summary = pad_summary(cube)
+    analyzed = summary['analyzed'] or 1
+    return '\n'.join([
+        f"- **Total Projects Analyzed**: {summary['analyzed']:,}",
+        f"- **Projects WITH PADs**: {summary['with_pad']:,} ({summary['with_pad'] / analyzed * 100:.1f}%)",
+        f"- **Projects WITHOUT PADs**: {summary['without_pad']:,} ({summary['without_pad'] / analyzed * 100:.1f}%)"
+    ])
+
+def update_readme(cube, filename='README.md'):
+    """Rewrite the README "Key Findings" bullets from the cube"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        lines = f.read().split('\n')
+
+    start = lines.index('## Key Findings') + 1
+    while start < len(lines) and not lines[start].startswith('- '):
+        start += 1
+    end = start
+    while end < len(lines) and lines[end].startswith('- '):
+        end += 1
+    lines[start:end] = format_key_findings(cube).split('\n')
+
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+def main():
+    """Load the rollup cube (rebuilding it if stale) and print the headline breakdowns"""
+    cube = load_rollups()
+    print(format_key_findings(cube))
+    if '--update-readme' in sys.argv[1:]:
+        update_readme(cube)
+        print("README.md key findings updated")
+
+    with_pad = rollup(cube, by=('country',), status='pad')
+    totals = rollup(cube, by=('country',))
+    print("\nPAD availability by country:")
+    for (country,), count in sorted(with_pad.items(), key=lambda item: -item[1])[:15]:
+        print(f"  {get_country_name(country)}: {count}/{totals[(country,)]}")
+
+    with_pad = rollup(cube, by=('sector',), status='pad')
+    print("\nPAD availability by sector code:")
+    for (sector,), total in sorted(rollup(cube, by=('sector',)).items(), key=lambda item: -item[1])[:15]:
+        print(f"  {sector}: {with_pad.get((sector,), 0)}/{total}")
+
+    print(f"\nRollups saved to {ROLLUPS_FILENAME} ({len(cube['cells'])} cells)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Long-running PAD scan service with warm browsers and a local job queue.
+
+Worker threads each keep one Chrome driver open between jobs, so a check
+costs one page load instead of process start, CSV parsing and browser launch.
+Jobs are held in memory and journalled to scan_jobs.jsonl; on restart the
+journal is replayed and unfinished jobs are queued again. Finished results
+are also appended to pad_results_service.jsonl (document links to
+document_links_service.jsonl) and folded into the rollup cube, so merge,
+report, diff and stats see them like any other scan output.
+
+Local HTTP API (127.0.0.1 only):
+
+    POST /jobs            {"project_ids": [...]}, {"urls": [...]} or {"all": true}
+                          -> {"jobs": [{"id": ..., "project_id": ..., "status": ...}]}
+    GET  /jobs/<id>       one job, including its result when done
+    GET  /jobs?status=s   jobs, optionally filtered by status
+    GET  /results?since=n&follow=1
+                          finished jobs as JSON lines, in completion order;
+                          with follow=1 the response stays open and streams
+                          new results as they finish
+    GET  /health          worker and queue counts
+
+Submissions are canonicalized by project identifier (see project_urls), so
+EN and FR page URLs of one project coalesce: a job for a project that is
+already queued or running is not added twice; the existing job is returned.
+"""
+
+import argparse
+import csv
+import json
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from data_files import CSV_FILENAME, RESULTS_FILENAME, service_results_filename
+from evidence_store import load_snippet_store, new_snippet_store, save_snippet_store
+from project_urls import canonical_project_url, project_id_from_url
+from rollups import add_result, load_rollups, save_rollups
+
+JOURNAL_FILENAME = 'scan_jobs.jsonl'
+LINKS_FILENAME = 'document_links_service.jsonl'
+DEFAULT_PORT = 8765
+
+class ScanService:
+    """Job queue, warm driver pool and journal shared by the HTTP handlers"""
+
+    def __init__(self, workers=2, csv_filename=CSV_FILENAME, journal_filename=JOURNAL_FILENAME, delay=1.0,
+                 results_filename=RESULTS_FILENAME, links_filename=LINKS_FILENAME):
+        self.workers = workers
+        self.journal_filename = journal_filename
+        self.delay = delay
+        self.csv_filename = csv_filename
+        self.results_filename = results_filename
+        self.service_results_filename = service_results_filename(results_filename)
+        self.links_filename = links_filename
+        self.catalogue = self._read_catalogue(csv_filename)
+        self.rollup_cube = load_rollups(csv_filename, results_filename)
+
+        self.jobs = {}
+        self.active = {}  # project_id -> id of its queued or running job
+        self.finished = []  # job ids in completion order
+        self.next_id = 1
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.snippet_store = load_snippet_store()
+        self.running = True
+        self.threads = []
+        self.drivers = {}  # worker number -> its warm driver
+
+        self._replay_journal()
+
+    @staticmethod
+    def _read_catalogue(csv_filename):
+        """Map project_id -> project_url, read once at startup"""
+        catalogue = {}
+        try:
+            with open(csv_filename, 'r', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    if row.get('project_url'):
+                        catalogue[row.get('Identifier', 'Unknown')] = row['project_url']
+        except FileNotFoundError:
+            print(f"Catalogue {csv_filename} not found; URLs will be built from project IDs")
+        return catalogue
+
+    def _replay_journal(self):
+        """Restore jobs from the journal and requeue unfinished ones"""
+        try:
+            with open(self.journal_filename, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        job = json.loads(line)
+                        self.jobs[job['id']] = job
+        except FileNotFoundError:
+            return
+
+        for job_id, job in self.jobs.items():
+            self.next_id = max(self.next_id, int(job_id) + 1)
+            if job['status'] in ('done', 'error'):
+                self.finished.append(job_id)
+            else:
+                job['status'] = 'queued'
+                self.active[job['project_id']] = job_id
+                self.queue.put(job_id)
+        self.finished.sort(key=lambda job_id: self.jobs[job_id].get('finished', 0))
+        print(f"Restored {len(self.jobs)} jobs from {self.journal_filename} ({self.queue.qsize()} queued)")
+
+    def _journal(self, job):
+        with open(self.journal_filename, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(job) + '\n')
+
+    def resolve(self, project_id=None, url=None):
+        """Canonical (project_id, url) for a submission
+
+        Language variants and other spellings of a project page URL resolve
+        to the same project, so they coalesce into one job.
+        """
+        if url is not None:
+            url_project_id = project_id_from_url(url)
+            if url_project_id:
+                project_id, url = url_project_id, canonical_project_url(url)
+            elif project_id is None:
+                project_id = url
+        if url is None:
+            url = canonical_project_url(self.catalogue.get(project_id) or project_id)
+        return project_id, url
+
+    def submit(self, project_id=None, url=None):
+        """Queue a check, or return the job already queued for the project"""
+        project_id, url = self.resolve(project_id, url)
+        with self.lock:
+            job_id = self.active.get(project_id)
+            if job_id is not None:
+                return self.jobs[job_id]
+
+            job_id = str(self.next_id)
+            self.next_id += 1
+            job = {'id': job_id, 'project_id': project_id, 'url': url,
+                   'status': 'queued', 'submitted': time.time()}
+            self.jobs[job_id] = job
+            self.active[project_id] = job_id
+            self._journal(job)
+        self.queue.put(job_id)
+        return job
+
+    def _record_result(self, result, document_links):
+        """Append a result (and its links) where merge, report, diff and stats read them"""
+        with open(self.service_results_filename, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(result, separators=(',', ':')) + '\n')
+        if document_links:
+            with open(self.links_filename, 'a', encoding='utf-8') as f:
+                for link in document_links:
+                    f.write(json.dumps(link) + '\n')
+        add_result(self.rollup_cube, result)
+        save_rollups(self.rollup_cube, self.csv_filename, self.results_filename)
+
+    def _finish(self, job, result, error=None, snippet_store=None):
+        with self.lock:
+            job['status'] = 'error' if error else 'done'
+            job['finished'] = time.time()
+            job['result'] = result
+            if error:
+                job['error'] = error
+            self.active.pop(job['project_id'], None)
+            self.finished.append(job['id'])
+            self._journal(job)
+            record = {key: value for key, value in result.items() if key != 'document_links'}
+            self._record_result(record, result.get('document_links'))
+            if snippet_store is not None:
+                self.snippet_store['snippets'].update(snippet_store['snippets'])
+                save_snippet_store(self.snippet_store)
+            self.changed.notify_all()
+
+    def _worker(self, number):
+        """Process jobs with one warm driver, restarting it if it dies"""
+        from check_all_pads import check_for_pad, create_driver
+
+        # Start the browser before the first job arrives
+        try:
+            driver = self.drivers[number] = create_driver()
+        except Exception as e:
+            print(f"Worker {number}: could not start driver yet: {str(e)}")
+            driver = None
+
+        while self.running:
+            try:
+                job_id = self.queue.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            job = self.jobs[job_id]
+            with self.lock:
+                job['status'] = 'running'
+                job['worker'] = number
+
+            try:
+                if driver is not None:
+                    try:
+                        driver.current_url
+                    except Exception:
+                        print(f"Worker {number}: driver stopped responding, restarting")
+                        driver = None
+                if driver is None:
+                    driver = self.drivers[number] = create_driver()
+
+                # Snippets go to a per-job store and are merged under the lock
+                snippet_store = new_snippet_store()
+                has_pad, evidence, document_links = check_for_pad(job['url'], job['project_id'], snippet_store,
+                                                                  driver=driver)
+                self._finish(job, {
+                    'project_id': job['project_id'],
+                    'url': job['url'],
+                    'has_pad': has_pad,
+                    'evidence': evidence,
+                    'document_links': document_links
+                }, snippet_store=snippet_store)
+            except Exception as e:
+                print(f"❌ Worker {number}: error processing {job['project_id']}: {str(e)}")
+                self._finish(job, {
+                    'project_id': job['project_id'],
+                    'url': job['url'],
+                    'has_pad': False,
+                    'evidence': [],
+                    'error': str(e)
+                }, error=str(e))
+
+            # Be respectful to the server between page loads
+            time.sleep(self.delay)
+
+        self._quit_driver(number)
+
+    def _quit_driver(self, number):
+        driver = self.drivers.pop(number, None)
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"Worker {number}: could not quit driver: {str(e)}")
+
+    def start(self):
+        for number in range(1, self.workers + 1):
+            thread = threading.Thread(target=self._worker, args=(number,), daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self, timeout=60):
+        """Let workers finish their current job, then quit every browser
+
+        Workers still busy after `timeout` seconds have their driver quit
+        from here, so no Chrome process outlives the service.
+        """
+        self.running = False
+        deadline = time.monotonic() + timeout
+        for thread in self.threads:
+            thread.join(max(0, deadline - time.monotonic()))
+        for number in list(self.drivers):
+            self._quit_driver(number)
+
+    def results_since(self, since):
+        """Finished jobs after position `since` in completion order"""
+        with self.lock:
+            return [self.jobs[job_id] for job_id in self.finished[since:]]
+
+    def wait_for_results(self, since, timeout):
+        with self.changed:
+            if len(self.finished) <= since:
+                self.changed.wait(timeout)
+            return [self.jobs[job_id] for job_id in self.finished[since:]]
+
+    def health(self):
+        with self.lock:
+            statuses = {}
+            for job in self.jobs.values():
+                statuses[job['status']] = statuses.get(job['status'], 0) + 1
+        return {'workers': self.workers, 'queued': self.queue.qsize(), 'jobs': statuses}
+
+def job_summary(job):
+    return {key: job[key] for key in ('id', 'project_id', 'url', 'status')}
+
+class ScanRequestHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def _send_json(self, data, status=200):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/jobs':
+            return self._send_json({'error': 'not found'}, 404)
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return self._send_json({'error': 'invalid JSON'}, 400)
+        if not isinstance(request, dict):
+            return self._send_json({'error': 'expected a JSON object'}, 400)
+        for key in ('project_ids', 'urls'):
+            values = request.get(key, [])
+            if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+                return self._send_json({'error': f'{key} must be a list of strings'}, 400)
+
+        jobs = []
+        if request.get('all'):
+            for project_id, url in self.service.catalogue.items():
+                jobs.append(self.service.submit(project_id, url))
+        for project_id in request.get('project_ids', []):
+            jobs.append(self.service.submit(project_id=project_id))
+        for url in request.get('urls', []):
+            jobs.append(self.service.submit(url=url))
+        if not jobs:
+            return self._send_json({'error': 'expected project_ids, urls or all'}, 400)
+        self._send_json({'jobs': [job_summary(job) for job in jobs]}, 202)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+
+        if parsed.path == '/health':
+            return self._send_json(self.service.health())
+
+        if parsed.path == '/jobs':
+            status = params.get('status', [None])[0]
+            with self.service.lock:
+                jobs = [job_summary(job) for job in self.service.jobs.values()
+                        if status is None or job['status'] == status]
+            return self._send_json({'jobs': jobs})
+
+        if parsed.path.startswith('/jobs/'):
+            job = self.service.jobs.get(parsed.path[len('/jobs/'):])
+            if job is None:
+                return self._send_json({'error': 'unknown job'}, 404)
+            return self._send_json(job)
+
+        if parsed.path == '/results':
+            since = params.get('since', ['0'])[0]
+            if not since.isdigit():
+                return self._send_json({'error': 'since must be a non-negative integer'}, 400)
+            return self._stream_results(int(since), params.get('follow', ['0'])[0] == '1')
+
+        self._send_json({'error': 'not found'}, 404)
+
+    def _stream_results(self, since, follow):
+        """Write finished jobs as JSON lines, optionally following new ones"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.end_headers()
+        try:
+            while True:
+                jobs = self.service.wait_for_results(since, 30) if follow else self.service.results_since(since)
+                for job in jobs:
+                    since += 1
+                    self.wfile.write((json.dumps(dict(job, seq=since)) + '\n').encode('utf-8'))
+                self.wfile.flush()
+                if not follow:
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(port=DEFAULT_PORT, workers=2, csv_filename=CSV_FILENAME, journal_filename=JOURNAL_FILENAME,
+          results_filename=RESULTS_FILENAME):
+    """Run the scan service until interrupted"""
+    service = ScanService(workers, csv_filename, journal_filename, results_filename=results_filename)
+    service.start()
+    ScanRequestHandler.service = service
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), ScanRequestHandler)
+    server.daemon_threads = True
+    print(f"Scan service listening on http://127.0.0.1:{port} with {workers} warm drivers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down scan service")
+    finally:
+        server.server_close()
+        print("Waiting for workers to finish and closing browsers")
+        service.stop()
+
+def submit(project_ids=None, urls=None, all_projects=False, port=DEFAULT_PORT):
+    """Submit jobs to a running service; returns the API response"""
+    from urllib.request import Request, urlopen
+
+    payload = {'project_ids': project_ids or [], 'urls': urls or []}
+    if all_projects:
+        payload['all'] = True
+    request = Request(f'http://127.0.0.1:{port}/jobs', data=json.dumps(payload).encode('utf-8'),
+                      headers={'Content-Type': 'application/json'}, method='POST')
+    with urlopen(request) as response:
+        return json.load(response)
+
+def main():
+    parser = argparse.ArgumentParser(description='Long-running PAD scan service')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='local HTTP port')
+    parser.add_argument('--workers', type=int, default=2, help='number of warm browser workers')
+    args = parser.parse_args()
+    serve(args.port, args.workers)
+
+if __name__ == "__main__":
+    main()